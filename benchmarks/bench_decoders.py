@@ -0,0 +1,187 @@
+"""Offline micro-benchmark of the HomGar payload decoders.
+
+Runs each decode_* function of homgar_api.py over the checked-in payload
+corpus (benchmarks/corpus/payloads.json) and reports per model:
+
+- ns/call: best per-call latency over the timing repeats
+- calls/s: the matching throughput
+- blocks/call, bytes/call: memory still held by the decoded results
+  (tracemalloc), i.e. what a poll keeps per reading
+- peak bytes: the largest transient allocation while decoding one payload
+
+Only the standard library and aiohttp (imported by homgar_api) are needed;
+Home Assistant is not. Save a run with --json and pass it to --compare on
+a later commit to see the change per model.
+
+    python benchmarks/bench_decoders.py --json before.json
+    python benchmarks/bench_decoders.py --compare before.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import types
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPONENT_DIR = ROOT / "custom_components" / "homgar"
+CORPUS = Path(__file__).resolve().parent / "corpus" / "payloads.json"
+
+# decode function -> name of the model constant whose corpus it decodes
+FUNCTIONS = {
+    "decode_moisture_simple": "MODEL_MOISTURE_SIMPLE",
+    "decode_moisture_full": "MODEL_MOISTURE_FULL",
+    "decode_rain": "MODEL_RAIN",
+    "decode_temphum": "MODEL_TEMPHUM",
+    "decode_flowmeter": "MODEL_FLOWMETER",
+    "decode_co2": "MODEL_CO2",
+    "decode_pool": "MODEL_POOL",
+    "decode_hws019wrf_v2": "MODEL_DISPLAY_HUB",
+}
+
+
+def load_api() -> types.ModuleType:
+    """Import homgar_api without running the integration's __init__ (which needs Home Assistant)."""
+    package = types.ModuleType("homgar")
+    package.__path__ = [str(COMPONENT_DIR)]
+    sys.modules["homgar"] = package
+    return importlib.import_module("homgar.homgar_api")
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_decoder(decode, payloads: list[str], repeat: int, number: int | None) -> float:
+    """Best seconds per call over repeat runs of the whole corpus."""
+
+    def run() -> None:
+        for payload in payloads:
+            decode(payload)
+
+    timer = timeit.Timer(run)
+    if number is None:
+        number, _elapsed = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / (number * len(payloads))
+
+
+def measure_allocations(decode, payloads: list[str], rounds: int = 50) -> tuple[float, float, int]:
+    """Return (blocks per call, bytes per call) held by results, and the peak transient bytes of one call."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        results = [decode(payload) for _ in range(rounds) for payload in payloads]
+        after = tracemalloc.take_snapshot()
+        stats = after.compare_to(before, "filename")
+        calls = len(results)
+        blocks = sum(stat.count_diff for stat in stats) / calls
+        size = sum(stat.size_diff for stat in stats) / calls
+        del results
+
+        peak = 0
+        for payload in payloads:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            decode(payload)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return blocks, size, peak
+
+
+def run(repeat: int, number: int | None, only: set[str] | None) -> dict:
+    api = load_api()
+    corpus = json.loads(CORPUS.read_text())["models"]
+    results = {}
+    for name, model_const in FUNCTIONS.items():
+        if only and name not in only:
+            continue
+        model = getattr(api, model_const)
+        payloads = corpus.get(model)
+        if not payloads:
+            print(f"{name}: no corpus payloads for {model}, skipped", file=sys.stderr)
+            continue
+        decode = getattr(api, name)
+        per_call = time_decoder(decode, payloads, repeat, number)
+        blocks, size, peak = measure_allocations(decode, payloads)
+        results[name] = {
+            "model": model,
+            "payloads": len(payloads),
+            "ns_per_call": round(per_call * 1e9, 1),
+            "calls_per_s": round(1 / per_call),
+            "blocks_per_call": round(blocks, 2),
+            "bytes_per_call": round(size, 1),
+            "peak_bytes": peak,
+        }
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict, baseline: dict | None) -> None:
+    meta = report["meta"]
+    print(f"commit {meta['commit'] or '?'}  {meta['implementation']} {meta['python']}  {meta['machine']}")
+    header = f"{'decoder':<24}{'ns/call':>10}{'calls/s':>12}{'blocks':>8}{'bytes':>9}{'peak':>8}"
+    if baseline:
+        header += f"{'Δ ns/call':>12}"
+    print(header)
+    base_results = baseline["results"] if baseline else {}
+    for name, r in report["results"].items():
+        line = (
+            f"{name:<24}{r['ns_per_call']:>10.1f}{r['calls_per_s']:>12,}"
+            f"{r['blocks_per_call']:>8.2f}{r['bytes_per_call']:>9.1f}{r['peak_bytes']:>8}"
+        )
+        base = base_results.get(name)
+        if base:
+            change = (r["ns_per_call"] - base["ns_per_call"]) / base["ns_per_call"] * 100
+            line += f"{change:>+11.1f}%"
+        print(line)
+    if baseline:
+        print(f"baseline: commit {baseline['meta'].get('commit') or '?'} at {baseline['meta'].get('at')}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats, best is kept (default 5)")
+    parser.add_argument("--number", type=int, help="corpus passes per repeat (default: auto, ~0.2 s)")
+    parser.add_argument("--only", nargs="+", metavar="DECODER", help="benchmark only these decode_* functions")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--compare", type=Path, help="results file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    report = run(args.repeat, args.number, set(args.only) if args.only else None)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Stand-in HomGar cloud for end-to-end load tests.
+
+Serves the endpoints the integration uses (login, token refresh,
+appHome/list, getDeviceByHid, getDeviceStatus) for a generated fleet of
+homes, hubs and sub-devices, with the response shapes of the real cloud.
+Sub-device values come from the decoder corpus (corpus/payloads.json);
+on every status request a share of the sub-devices moves on to its next
+payload with a new report time, the rest report the same reading again.
+
+Knobs for load and failure testing:
+
+- latency: fixed delay plus random jitter before every response
+- error rate: share of authenticated GETs answered with an HTTP error
+- token expiry: tokens stop working after this many seconds, although
+  login still advertises the normal lifetime (code 401 in the body,
+  like the real cloud)
+
+Counters are served at GET /_fake/stats. Run it on its own to point a
+client at it, or let load_poll.py start one per fleet size:
+
+    python benchmarks/fake_cloud.py --hubs 10 --subs-per-hub 8 --port 8080
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import Counter
+from pathlib import Path
+
+from aiohttp import web
+
+CORPUS = Path(__file__).resolve().parent / "corpus" / "payloads.json"
+
+LOGIN_PATH = "/auth/basic/app/login"
+REFRESH_TOKEN_PATH = "/auth/basic/app/refreshToken"
+HOMES_PATH = "/app/member/appHome/list"
+DEVICES_PATH = "/app/device/getDeviceByHid"
+STATUS_PATH = "/app/device/getDeviceStatus"
+STATS_PATH = "/_fake/stats"
+
+TOKEN_LIFETIME = 86400  # seconds advertised by login, like the real cloud
+
+
+class FakeHomGarCloud:
+    """Generated fleet plus the aiohttp application serving it."""
+
+    def __init__(
+        self,
+        homes: int = 1,
+        hubs: int = 1,
+        subs_per_hub: int = 8,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        error_status: int = 503,
+        retry_after: int | None = None,
+        token_expiry: float | None = None,
+        change_rate: float = 0.2,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.token_expiry = token_expiry
+        self.change_rate = change_rate
+        self._random = random.Random(seed)
+
+        corpus = json.loads(CORPUS.read_text())["models"]
+        self._payloads: dict[str, list[str]] = corpus
+        models = sorted(corpus)
+
+        # hid -> home, hid -> hubs, mid -> per sub-device [addr, model, payload index, report time]
+        self.homes: list[dict] = []
+        self.hubs: dict[int, list[dict]] = {}
+        self._subs: dict[int, list[list]] = {}
+        now_ms = int(time.time() * 1000)
+        mid = 10000
+        for home in range(homes):
+            hid = 1000 + home
+            self.homes.append({"hid": hid, "homeName": f"Home {home + 1}"})
+            self.hubs[hid] = []
+        for hub in range(hubs):
+            mid += 1
+            hid = 1000 + hub % homes
+            subs = []
+            sub_devices = []
+            for addr in range(1, subs_per_hub + 1):
+                model = models[(hub * subs_per_hub + addr) % len(models)]
+                subs.append([addr, model, self._random.randrange(len(corpus[model])), now_ms])
+                sub_devices.append({"addr": addr, "name": f"Sensor {mid}-{addr}", "model": model})
+            self._subs[mid] = subs
+            self.hubs[hid].append(
+                {
+                    "mid": mid,
+                    "name": f"Hub {mid}",
+                    "model": "HWG023WBRF-V2",
+                    "mac": f"AA:BB:CC:{mid >> 16 & 0xFF:02X}:{mid >> 8 & 0xFF:02X}:{mid & 0xFF:02X}",
+                    "sn": f"SN{mid:010d}",
+                    "subDevices": sub_devices,
+                }
+            )
+
+        self.tokens: dict[str, float] = {}  # token -> monotonic time it stops working
+        self.requests: Counter[str] = Counter()
+        self.stats: Counter[str] = Counter()
+
+        self.app = web.Application()
+        self.app.router.add_post(LOGIN_PATH, self._login)
+        self.app.router.add_post(REFRESH_TOKEN_PATH, self._refresh)
+        self.app.router.add_get(HOMES_PATH, self._list_homes)
+        self.app.router.add_get(DEVICES_PATH, self._devices_by_hid)
+        self.app.router.add_get(STATUS_PATH, self._device_status)
+        self.app.router.add_get(STATS_PATH, self._stats)
+
+    @property
+    def sub_devices(self) -> int:
+        return sum(len(subs) for subs in self._subs.values())
+
+    # --- helpers ---
+
+    async def _delay(self) -> None:
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _ok(data, **extra) -> web.Response:
+        return web.json_response({"code": 0, "msg": "success", "data": data, **extra})
+
+    def _issue_token(self) -> web.Response:
+        token = hashlib.md5(f"{time.monotonic_ns()}-{len(self.tokens)}".encode()).hexdigest()
+        refresh_token = hashlib.md5(token.encode()).hexdigest()
+        expiry = self.token_expiry if self.token_expiry is not None else TOKEN_LIFETIME
+        self.tokens[token] = time.monotonic() + expiry
+        return self._ok(
+            {"token": token, "refreshToken": refresh_token, "tokenExpired": TOKEN_LIFETIME},
+            ts=int(time.time() * 1000),
+        )
+
+    def _check(self, request: web.Request) -> web.Response | None:
+        """Error response for an injected failure or a bad token, else None."""
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats["errors_injected"] += 1
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+            return web.Response(status=self.error_status, headers=headers)
+        expires_at = self.tokens.get(request.headers.get("auth", ""))
+        if expires_at is None or time.monotonic() >= expires_at:
+            self.stats["token_rejections"] += 1
+            return web.json_response({"code": 401, "msg": "token expired"})
+        return None
+
+    # --- endpoints ---
+
+    async def _login(self, request: web.Request) -> web.Response:
+        self.requests["login"] += 1
+        await self._delay()
+        body = await request.json()
+        if not body.get("phoneOrEmail") or not body.get("password"):
+            return web.json_response({"code": 1001, "msg": "bad credentials"})
+        return self._issue_token()
+
+    async def _refresh(self, request: web.Request) -> web.Response:
+        self.requests["refreshToken"] += 1
+        await self._delay()
+        body = await request.json()
+        if not body.get("refreshToken"):
+            return web.json_response({"code": 401, "msg": "bad refresh token"})
+        return self._issue_token()
+
+    async def _list_homes(self, request: web.Request) -> web.Response:
+        self.requests["list_homes"] += 1
+        await self._delay()
+        return self._check(request) or self._ok(self.homes)
+
+    async def _devices_by_hid(self, request: web.Request) -> web.Response:
+        self.requests["getDeviceByHid"] += 1
+        await self._delay()
+        error = self._check(request)
+        if error is not None:
+            return error
+        hubs = self.hubs.get(int(request.query.get("hid", 0)))
+        if hubs is None:
+            return web.json_response({"code": 4004, "msg": "home not found"})
+        return self._ok(hubs)
+
+    async def _device_status(self, request: web.Request) -> web.Response:
+        self.requests["getDeviceStatus"] += 1
+        await self._delay()
+        error = self._check(request)
+        if error is not None:
+            return error
+        mid = int(request.query.get("mid", 0))
+        subs = self._subs.get(mid)
+        if subs is None:
+            return web.json_response({"code": 4004, "msg": "device not found"})
+
+        now_ms = int(time.time() * 1000)
+        # Hubs report their own state next to the D<addr> sub-device entries
+        status = [{"id": "connected", "value": "1", "time": now_ms}]
+        for sub in subs:
+            addr, model, index, report_time = sub
+            if self._random.random() < self.change_rate:
+                index = sub[2] = (index + 1) % len(self._payloads[model])
+                report_time = sub[3] = now_ms
+            status.append({"id": f"D{addr:02d}", "value": self._payloads[model][index], "time": report_time})
+        return self._ok({"mid": mid, "subDeviceStatus": status})
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"requests": dict(self.requests), **self.stats, "sub_devices": self.sub_devices}
+        )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Fleet-independent knobs, shared with load_poll.py."""
+    parser.add_argument("--latency-ms", type=float, default=0, help="fixed delay before every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random extra delay, uniform up to this")
+    parser.add_argument("--error-rate", type=float, default=0, help="share of API GETs failing, 0..1")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected errors (default 503)")
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with injected errors")
+    parser.add_argument("--token-expiry", type=float, help="seconds after which tokens stop working")
+    parser.add_argument("--change-rate", type=float, default=0.2, help="share of sub-devices with a new reading per status request")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+async def serve(cloud: FakeHomGarCloud, host: str, port: int) -> None:
+    runner = web.AppRunner(cloud.app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_host, bound_port = runner.addresses[0][:2]
+    # load_poll.py reads the URL from the first line
+    print(f"http://{bound_host}:{bound_port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--homes", type=int, default=1)
+    parser.add_argument("--hubs", type=int, default=1, help="hubs in total, spread over the homes")
+    parser.add_argument("--subs-per-hub", type=int, default=8)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    cloud = FakeHomGarCloud(
+        homes=args.homes,
+        hubs=args.hubs,
+        subs_per_hub=args.subs_per_hub,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        token_expiry=args.token_expiry,
+        change_rate=args.change_rate,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(serve(cloud, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
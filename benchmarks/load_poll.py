@@ -0,0 +1,321 @@
+"""End-to-end poll load test against the fake HomGar cloud.
+
+For every fleet size (in sub-devices) a fake_cloud.py server is started in
+a subprocess and the integration's own HomGarClient, HomGarAccount and
+one HomGarCoordinator per hub poll it the way async_setup_entry does:
+log in, fetch the topology, then refresh all hub coordinators together
+for --polls rounds. Reported per fleet size:
+
+- topology s: login plus getDeviceByHid for every home
+- first / steady s: wall time of the first poll round (everything
+  decoded) and the median of the later rounds (mostly memo hits)
+- req/poll: requests the server saw per round, retries included
+- failed: hub polls that ended in UpdateFailed over all rounds
+- retries, renewals: client retries and token logins/refreshes
+- retained KB, B/sub: memory still held after the last round by the
+  client, account and coordinators (tracemalloc), and per sub-device
+- peak KB: the largest traced allocation during the run
+
+The JSON output also holds the client's latency windows (request
+endpoints and poll phases, as shown by the diagnostic timing sensors).
+
+With --cassette, a session recorded by the integration (the "record
+cassette" option) is replayed instead: the homes and hubs of the
+recording are polled and every request gets its recorded response, at
+full speed or, with --speed 1, after the recorded response time.
+
+tracemalloc slows Python code down; pass --no-tracemalloc for wall times
+only. Needs Home Assistant installed (the coordinator builds on it), but
+no running instance.
+
+    python benchmarks/load_poll.py --subs 100 1000 5000
+    python benchmarks/load_poll.py --subs 2000 --latency-ms 150 --error-rate 0.05
+    python benchmarks/load_poll.py --cassette homgar_cassettes/<entry>.json --polls 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Awaitable, Callable
+
+import aiohttp
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from bench_decoders import git_commit  # noqa: E402
+from custom_components.homgar.const import (  # noqa: E402
+    CONF_ADAPTIVE_POLLING,
+    CONF_HIDS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+)
+from custom_components.homgar.coordinator import HomGarAccount, HomGarCoordinator  # noqa: E402
+from custom_components.homgar.cassette import ReplaySession  # noqa: E402
+from custom_components.homgar.homgar_api import DEFAULT_BASE_URL, HomGarClient  # noqa: E402
+from fake_cloud import STATS_PATH, add_arguments  # noqa: E402
+
+
+class _ConfigEntries:
+    """The config entry calls HomGarAccount makes, without a config entry registry."""
+
+    def async_update_entry(self, entry, data) -> None:
+        entry.data = data
+
+    def async_schedule_reload(self, entry_id: str) -> None:
+        pass
+
+
+async def start_cloud(args, hubs: int, homes: int) -> tuple[asyncio.subprocess.Process, str]:
+    cmd = [
+        sys.executable, str(BENCH_DIR / "fake_cloud.py"),
+        "--homes", str(homes),
+        "--hubs", str(hubs),
+        "--subs-per-hub", str(args.subs_per_hub),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate),
+        "--error-status", str(args.error_status),
+        "--change-rate", str(args.change_rate),
+        "--seed", str(args.seed),
+    ]
+    if args.retry_after is not None:
+        cmd += ["--retry-after", str(args.retry_after)]
+    if args.token_expiry is not None:
+        cmd += ["--token-expiry", str(args.token_expiry)]
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE)
+    url = (await proc.stdout.readline()).decode().strip()
+    if not url:
+        await proc.wait()
+        raise RuntimeError(f"fake cloud did not start (exit code {proc.returncode})")
+    return proc, url
+
+
+async def server_stats(session: aiohttp.ClientSession, url: str) -> dict:
+    async with session.get(f"{url}{STATS_PATH}") as resp:
+        return await resp.json()
+
+
+async def poll_fleet(
+    args,
+    session,
+    base_url: str,
+    hids: list[int] | None,
+    requests_seen: Callable[[], Awaitable[int]],
+    config_dir: str,
+) -> dict:
+    """Poll through session; hids None means listing the homes like the config flow."""
+    hass = HomeAssistant(config_dir)
+    hass.config_entries = _ConfigEntries()
+    client = HomGarClient(
+        "31",
+        "load@example.com",
+        "load-test",
+        session,
+        request_timeout=args.request_timeout,
+        max_requests_per_second=args.rps,
+        max_requests_per_minute=args.rpm,
+        base_url=base_url,
+    )
+    if args.tracemalloc:
+        gc.collect()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    if hids is None:
+        hids = [home["hid"] for home in await client.list_homes()]
+    entry = SimpleNamespace(
+        entry_id="load_poll",
+        title="HomGar load test",
+        data={CONF_HIDS: hids},
+        options={
+            CONF_MAX_CONCURRENT_REQUESTS: args.concurrency,
+            CONF_ADAPTIVE_POLLING: False,
+        },
+    )
+    account = HomGarAccount(hass, client, entry)
+    await account.async_ensure_topology()
+    topology_s = time.perf_counter() - start
+
+    coordinators = {mid: HomGarCoordinator(hass, account, entry, mid) for mid in account.hubs}
+    account.coordinators = coordinators
+
+    rounds = []
+    failed = 0
+    for _ in range(args.polls):
+        seen = await requests_seen()
+        start = time.perf_counter()
+        await asyncio.gather(*(c.async_refresh() for c in coordinators.values()))
+        wall = time.perf_counter() - start
+        failed += sum(not c.last_update_success for c in coordinators.values())
+        rounds.append((wall, await requests_seen() - seen))
+
+    sub_devices = sum(len(c.data or {}) for c in coordinators.values())
+    retained = peak = None
+    if args.tracemalloc:
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        retained = current - baseline
+
+    account.async_shutdown()
+    await client.async_close()
+    await hass.async_stop(force=True)
+
+    walls = [wall for wall, _requests in rounds]
+    return {
+        "hubs": len(coordinators),
+        "sub_devices": sub_devices,
+        "topology_s": round(topology_s, 3),
+        "first_poll_s": round(walls[0], 3),
+        "steady_poll_s": round(statistics.median(walls[1:]), 3) if len(walls) > 1 else None,
+        "max_poll_s": round(max(walls), 3),
+        "requests_per_poll": round(statistics.mean(requests for _wall, requests in rounds), 1),
+        "failed_polls": failed,
+        "retries": client.stats["retries"],
+        "token_renewals": client.stats["logins"] + client.stats["token_refreshes"],
+        "decode_misses": sum(c.decode_cache_misses for c in coordinators.values()),
+        "decode_hits": sum(c.decode_cache_hits for c in coordinators.values()),
+        "retained_bytes": retained,
+        "bytes_per_sub": round(retained / sub_devices) if retained is not None and sub_devices else None,
+        "peak_bytes": peak,
+        "latency_ms": client.latency.summary(),
+    }
+
+
+async def run_fake_cloud(args, subs: int, config_dir: str) -> dict:
+    hubs = math.ceil(subs / args.subs_per_hub)
+    homes = math.ceil(hubs / args.hubs_per_home)
+    proc, url = await start_cloud(args, hubs, homes)
+    try:
+        async with aiohttp.ClientSession() as session, aiohttp.ClientSession() as stats_session:
+
+            async def requests_seen() -> int:
+                return sum((await server_stats(stats_session, url))["requests"].values())
+
+            result = await poll_fleet(args, session, url, None, requests_seen, config_dir)
+            server = await server_stats(stats_session, url)
+    finally:
+        proc.terminate()
+        await proc.wait()
+    result["errors_injected"] = server.get("errors_injected", 0)
+    result["token_rejections"] = server.get("token_rejections", 0)
+    return result
+
+
+async def run_cassette(args, config_dir: str) -> dict:
+    session = ReplaySession.from_file(args.cassette, args.speed)
+    # The homes polled when the cassette was recorded
+    hids = sorted({
+        int(interaction["params"]["hid"])
+        for interaction in json.loads(Path(args.cassette).read_text())["interactions"]
+        if "hid" in interaction["params"]
+    })
+
+    async def requests_seen() -> int:
+        return session.served + sum(session.unmatched.values())
+
+    result = await poll_fleet(args, session, DEFAULT_BASE_URL, hids, requests_seen, config_dir)
+    result["rewound"] = sum(session.rewound.values())
+    result["unmatched"] = {" ".join((method, path)): count for (method, path, _params), count in session.unmatched.items()}
+    return result
+
+
+async def run(args) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        if args.cassette:
+            results[str(args.cassette)] = await run_cassette(args, config_dir)
+        else:
+            for subs in args.subs:
+                results[str(subs)] = await run_fake_cloud(args, subs, config_dir)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "polls": args.polls,
+            "concurrency": args.concurrency,
+            "cassette": str(args.cassette) if args.cassette else None,
+            "speed": args.speed if args.cassette else None,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "tracemalloc": args.tracemalloc,
+        },
+        "results": results,
+    }
+
+
+def _kb(value: int | None) -> str:
+    return f"{value / 1024:,.0f}" if value is not None else "-"
+
+
+def print_report(report: dict) -> None:
+    meta = report["meta"]
+    print(
+        f"commit {meta['commit'] or '?'}  Python {meta['python']}  {meta['machine']}  "
+        f"{meta['polls']} polls, concurrency {meta['concurrency']}"
+    )
+    print(
+        f"{'subs':>7}{'hubs':>6}{'topology s':>12}{'first s':>9}{'steady s':>10}{'max s':>8}"
+        f"{'req/poll':>10}{'failed':>8}{'retries':>9}{'renewals':>10}{'retained KB':>13}{'B/sub':>7}{'peak KB':>9}"
+    )
+    for r in report["results"].values():
+        steady = f"{r['steady_poll_s']:.3f}" if r["steady_poll_s"] is not None else "-"
+        per_sub = f"{r['bytes_per_sub']:,}" if r["bytes_per_sub"] is not None else "-"
+        print(
+            f"{r['sub_devices']:>7}{r['hubs']:>6}{r['topology_s']:>12.3f}{r['first_poll_s']:>9.3f}"
+            f"{steady:>10}{r['max_poll_s']:>8.3f}{r['requests_per_poll']:>10}{r['failed_polls']:>8}"
+            f"{r['retries']:>9}{r['token_renewals']:>10}{_kb(r['retained_bytes']):>13}{per_sub:>7}{_kb(r['peak_bytes']):>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--subs", type=int, nargs="+", default=[100, 1000, 5000], help="fleet sizes in sub-devices")
+    parser.add_argument("--subs-per-hub", type=int, default=8)
+    parser.add_argument("--hubs-per-home", type=int, default=25)
+    parser.add_argument("--polls", type=int, default=5, help="poll rounds per fleet size (default 5)")
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+        help=f"max concurrent requests option (default {DEFAULT_MAX_CONCURRENT_REQUESTS})",
+    )
+    # The integration defaults (4/s, 120/min) would make large fleets take minutes per round
+    parser.add_argument("--rps", type=float, default=1000, help="request budget per second (default 1000)")
+    parser.add_argument("--rpm", type=float, default=60000, help="request budget per minute (default 60000)")
+    parser.add_argument("--request-timeout", type=float, default=30)
+    parser.add_argument("--cassette", type=Path, help="replay this recorded session instead of a fake cloud")
+    parser.add_argument(
+        "--speed", type=float, default=0,
+        help="cassette replay: 0 answers at once, 1 takes the recorded response times (default 0)",
+    )
+    parser.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false", help="skip memory tracing")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
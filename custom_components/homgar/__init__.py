@@ -1,13 +1,48 @@
+import asyncio
 import logging
-from datetime import timedelta
+
+import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
-from .homgar_api import HomGarClient
+from .const import (
+    DOMAIN,
+    CONF_DEDICATED_CONNECTION,
+    CONF_CONNECTION_LIMIT_PER_HOST,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_DNS_CACHE_TTL,
+    CONF_HTTP_COMPRESSION,
+    CONF_REQUEST_TIMEOUT,
+    CONF_MAX_RETRIES,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_MAX_REQUESTS_PER_MINUTE,
+    CONF_TRACE_ENABLED,
+    CONF_TRACE_SAMPLE_PERCENT,
+    CONF_TRACE_MIDS,
+    CONF_TRACE_ADDRS,
+    CONF_TRACE_MODELS,
+    CONF_RECORD_CASSETTE,
+    DEFAULT_DEDICATED_CONNECTION,
+    DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_HTTP_COMPRESSION,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DEFAULT_MAX_REQUESTS_PER_MINUTE,
+    DEFAULT_TRACE_ENABLED,
+    DEFAULT_TRACE_SAMPLE_PERCENT,
+    DEFAULT_RECORD_CASSETTE,
+    CASSETTE_DIR,
+)
+from .cassette import CassetteRecorder
+from .homgar_api import HomGarClient, HomGarApiError
+from .tracing import PayloadTracer, parse_filter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,31 +62,133 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     email = entry.data["email"]
     password = entry.data["password"]
 
-    client = HomGarClient(area_code, email, password, session)
+    options = entry.options
+    tracer = PayloadTracer(
+        enabled=options.get(CONF_TRACE_ENABLED, DEFAULT_TRACE_ENABLED),
+        sample_rate=options.get(CONF_TRACE_SAMPLE_PERCENT, DEFAULT_TRACE_SAMPLE_PERCENT) / 100,
+        mids=parse_filter(options.get(CONF_TRACE_MIDS), int),
+        addrs=parse_filter(options.get(CONF_TRACE_ADDRS), int),
+        models=parse_filter(options.get(CONF_TRACE_MODELS)),
+    )
+    client = HomGarClient(
+        area_code,
+        email,
+        password,
+        session,
+        request_timeout=options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT),
+        max_retries=options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+        max_requests_per_second=options.get(CONF_MAX_REQUESTS_PER_SECOND, DEFAULT_MAX_REQUESTS_PER_SECOND),
+        max_requests_per_minute=options.get(CONF_MAX_REQUESTS_PER_MINUTE, DEFAULT_MAX_REQUESTS_PER_MINUTE),
+        tracer=tracer,
+    )
     # Restore tokens if present
     client.restore_tokens(entry.data)
 
-    # Simple: one coordinator per config entry
-    from .coordinator import HomGarCoordinator
-
-    coordinator = HomGarCoordinator(hass, client, entry)
-
-    await coordinator.async_config_entry_first_refresh()
+    if options.get(CONF_DEDICATED_CONNECTION, DEFAULT_DEDICATED_CONNECTION):
+        client.use_dedicated_session(
+            limit_per_host=options.get(CONF_CONNECTION_LIMIT_PER_HOST, DEFAULT_CONNECTION_LIMIT_PER_HOST),
+            keepalive_timeout=options.get(CONF_KEEPALIVE_TIMEOUT, DEFAULT_KEEPALIVE_TIMEOUT),
+            dns_cache_ttl=options.get(CONF_DNS_CACHE_TTL, DEFAULT_DNS_CACHE_TTL),
+            compression=options.get(CONF_HTTP_COMPRESSION, DEFAULT_HTTP_COMPRESSION),
+        )
+    if options.get(CONF_RECORD_CASSETTE, DEFAULT_RECORD_CASSETTE):
+        client.start_recording(CassetteRecorder())
+
+    # One account per config entry, one lightweight coordinator per hub
+    from .coordinator import HomGarAccount, HomGarCoordinator
+
+    account = HomGarAccount(hass, client, entry)
+    # With a stored snapshot, entities are created right away and the cloud is polled in the background
+    snapshot = await account.async_load_snapshot()
+    if snapshot is None:
+        try:
+            await account.async_ensure_topology()
+        except (HomGarApiError, aiohttp.ClientError, TimeoutError) as err:
+            await client.async_close()
+            raise ConfigEntryNotReady(f"Unable to fetch HomGar devices: {err}") from err
+
+    coordinators = {
+        mid: HomGarCoordinator(hass, account, entry, mid) for mid in account.hubs
+    }
+    account.coordinators = coordinators
+
+    if snapshot is not None:
+        for mid, coordinator in coordinators.items():
+            if mid in snapshot:
+                coordinator.async_restore(snapshot[mid])
+    else:
+        await asyncio.gather(*(c.async_refresh() for c in coordinators.values()))
+        if coordinators and not any(c.last_update_success for c in coordinators.values()):
+            await client.async_close()
+            raise ConfigEntryNotReady("No HomGar hub could be reached")
+        for mid, coordinator in coordinators.items():
+            if not coordinator.last_update_success:
+                _LOGGER.warning("HomGar hub mid=%s failed its first update; its sensors are added once it responds", mid)
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "client": client,
-        "coordinator": coordinator,
+        "account": account,
+        "coordinators": coordinators,
+        "options": dict(entry.options),
     }
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    if client.recorder is not None:
+        recorder = client.recorder
+
+        async def _async_save_on_stop(event: Event) -> None:
+            await _async_save_cassette(hass, entry, recorder)
+
+        entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save_on_stop))
+    client.start_token_renewal()
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if snapshot is not None:
+        for mid, coordinator in coordinators.items():
+            entry.async_create_background_task(
+                hass, coordinator.async_refresh(), f"homgar first refresh mid={mid}"
+            )
+
     return True
 
 
+async def _async_save_cassette(hass: HomeAssistant, entry: ConfigEntry, recorder: CassetteRecorder) -> None:
+    """Write the recorded session to the cassette directory under the config directory."""
+    path = hass.config.path(CASSETTE_DIR, f"{entry.entry_id}_{recorder.started_at:%Y%m%dT%H%M%SZ}.json")
+    await hass.async_add_executor_job(recorder.save, path)
+    _LOGGER.info("Saved HomGar cassette with %s requests to %s", len(recorder.interactions), path)
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload when the options change."""
+    runtime = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if runtime is None:
+        # Unloaded meanwhile; e.g. the token write flushed on unload
+        return
+    if dict(entry.options) != runtime["options"]:
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the stored snapshot when the entry is deleted."""
+    from .coordinator import snapshot_store
+
+    await snapshot_store(hass, entry.entry_id).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
-    return unload_ok
\ No newline at end of file
+        runtime = hass.data[DOMAIN].get(entry.entry_id)
+        if runtime:
+            # Flush a pending token write before the runtime data goes away
+            runtime["account"].async_shutdown()
+            del hass.data[DOMAIN][entry.entry_id]
+            client = runtime["client"]
+            await client.async_close()
+            if client.recorder is not None:
+                await _async_save_cassette(hass, entry, client.recorder)
+    return unload_ok
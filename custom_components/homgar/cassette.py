@@ -0,0 +1,256 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime, timezone
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .const import CASSETTE_MAX_INTERACTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+REDACTED = "**REDACTED**"
+# Keys whose values never go into a cassette; ids (hid, mid, addr) are kept for replay
+CASSETTE_REDACT = frozenset(
+    {"token", "refreshToken", "password", "phoneOrEmail", "email", "mac", "sn", "auth"}
+)
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in CASSETTE_REDACT and item is not None else _redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _key(method: str, path: str, params: dict | None) -> tuple:
+    """Match requests on method, path and query parameters, never on bodies or headers."""
+    return (method, path, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+
+class CassetteRecorder:
+    """Redacted request/response pairs of one client session, with their timing.
+
+    Only the method, path and query parameters of a request are kept, and
+    every response body passes through CASSETTE_REDACT. Recording stops
+    once max_interactions pairs are held.
+    """
+
+    def __init__(self, max_interactions: int = CASSETTE_MAX_INTERACTIONS) -> None:
+        self.interactions: list[dict] = []
+        self.max_interactions = max_interactions
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.monotonic()
+
+    @property
+    def full(self) -> bool:
+        return len(self.interactions) >= self.max_interactions
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        params: dict | None,
+        started: float,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> None:
+        if self.full:
+            return
+        interaction: dict[str, Any] = {
+            "at_ms": round((started - self._start) * 1000, 1),
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "method": method,
+            "path": urlsplit(url).path,
+            "params": {k: str(v) for k, v in (params or {}).items()},
+            "status": status,
+        }
+        if headers:
+            interaction["headers"] = headers
+        try:
+            interaction["json"] = _redact(json.loads(body))
+        except ValueError:
+            interaction["text"] = body.decode("utf-8", "replace")
+        self.interactions.append(interaction)
+        if self.full:
+            _LOGGER.info("HomGar cassette full after %s requests, recording stopped", self.max_interactions)
+
+    def dump(self) -> dict:
+        return {
+            "version": CASSETTE_VERSION,
+            "recorded_at": self.started_at.isoformat(),
+            "interactions": list(self.interactions),
+        }
+
+    def save(self, path: str) -> None:
+        """Write the cassette as JSON; blocking, run it in an executor."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.dump(), file, indent=1)
+
+
+class _RecordedRequest:
+    """Context manager around a real request that reads and records the response."""
+
+    def __init__(self, session: aiohttp.ClientSession, recorder: CassetteRecorder, method: str, url: str, kwargs: dict) -> None:
+        self._session = session
+        self._recorder = recorder
+        self._method = method
+        self._url = url
+        self._kwargs = kwargs
+        self._context = None
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        started = time.monotonic()
+        self._context = self._session.request(self._method, self._url, **self._kwargs)
+        resp = await self._context.__aenter__()
+        try:
+            # The body is cached on the response, so the client can still read it
+            body = await resp.read()
+        except BaseException as err:
+            await self._context.__aexit__(type(err), err, err.__traceback__)
+            raise
+        retry_after = resp.headers.get("Retry-After")
+        self._recorder.add(
+            self._method,
+            self._url,
+            self._kwargs.get("params"),
+            started,
+            resp.status,
+            {"Retry-After": retry_after} if retry_after is not None else {},
+            body,
+        )
+        return resp
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._context.__aexit__(*exc_info)
+
+
+class RecordingSession:
+    """Session wrapper that records every request made through it."""
+
+    def __init__(self, session: aiohttp.ClientSession, recorder: CassetteRecorder) -> None:
+        self._session = session
+        self.recorder = recorder
+
+    def get(self, url: str, **kwargs) -> _RecordedRequest:
+        return _RecordedRequest(self._session, self.recorder, "GET", url, kwargs)
+
+    def post(self, url: str, **kwargs) -> _RecordedRequest:
+        return _RecordedRequest(self._session, self.recorder, "POST", url, kwargs)
+
+    async def close(self) -> None:
+        await self._session.close()
+
+
+class ReplayResponse:
+    """The part of aiohttp.ClientResponse the client reads."""
+
+    def __init__(self, interaction: dict) -> None:
+        self.status = interaction["status"]
+        self.headers = interaction.get("headers", {})
+        self._interaction = interaction
+
+    async def read(self) -> bytes:
+        if "json" in self._interaction:
+            return json.dumps(self._interaction["json"]).encode()
+        return self._interaction.get("text", "").encode()
+
+    async def json(self) -> Any:
+        if "json" in self._interaction:
+            return self._interaction["json"]
+        return json.loads(self._interaction.get("text", ""))
+
+    async def __aenter__(self) -> "ReplayResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+class ReplaySession:
+    """Session stand-in answering from a recorded cassette instead of the cloud.
+
+    Requests get the recorded responses for the same method, path and
+    query in recording order, starting over once they are used up. With
+    speed 0 answers are immediate; otherwise each one takes its recorded
+    time multiplied by speed (1 replays in real time). Login and refresh
+    responses get a current "ts", so redacted tokens are valid for their
+    recorded lifetime; if the cassette has none, a token is made up.
+    """
+
+    def __init__(self, cassette: dict, speed: float = 0) -> None:
+        if cassette.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {cassette.get('version')}")
+        self.speed = speed
+        self._recorded: dict[tuple, list[dict]] = defaultdict(list)
+        for interaction in cassette["interactions"]:
+            self._recorded[_key(interaction["method"], interaction["path"], interaction["params"])].append(interaction)
+        self._queues: dict[tuple, deque[dict]] = {}
+        self.served = 0
+        self.rewound: Counter[tuple] = Counter()  # keys replayed from the start again
+        self.unmatched: Counter[tuple] = Counter()
+
+    @classmethod
+    def from_file(cls, path: str, speed: float = 0) -> "ReplaySession":
+        with open(path, encoding="utf-8") as file:
+            return cls(json.load(file), speed)
+
+    def get(self, url: str, params: dict | None = None, **kwargs) -> "_ReplayedRequest":
+        return _ReplayedRequest(self, "GET", url, params)
+
+    def post(self, url: str, **kwargs) -> "_ReplayedRequest":
+        return _ReplayedRequest(self, "POST", url, None)
+
+    async def close(self) -> None:
+        pass
+
+    def _next(self, method: str, url: str, params: dict | None) -> dict:
+        path = urlsplit(url).path
+        key = _key(method, path, params)
+        recorded = self._recorded.get(key)
+        if not recorded:
+            self.unmatched[key] += 1
+            if method == "POST" and path.startswith("/auth/"):
+                token = {"token": REDACTED, "refreshToken": REDACTED, "tokenExpired": 86400}
+                return {"status": 200, "elapsed_ms": 0, "json": {"code": 0, "data": token}}
+            return {"status": 404, "elapsed_ms": 0, "text": "Not recorded"}
+        queue = self._queues.get(key)
+        if not queue:
+            if queue is not None:
+                self.rewound[key] += 1
+            queue = self._queues[key] = deque(recorded)
+        interaction = queue.popleft()
+        self.served += 1
+        body = interaction.get("json")
+        if isinstance(body, dict) and path.startswith("/auth/"):
+            interaction = {**interaction, "json": {**body, "ts": int(time.time() * 1000)}}
+        return interaction
+
+
+class _ReplayedRequest:
+    def __init__(self, session: ReplaySession, method: str, url: str, params: dict | None) -> None:
+        self._session = session
+        self._method = method
+        self._url = url
+        self._params = params
+
+    async def __aenter__(self) -> ReplayResponse:
+        interaction = self._session._next(self._method, self._url, self._params)
+        if self._session.speed:
+            await asyncio.sleep(interaction["elapsed_ms"] / 1000 * self._session.speed)
+        return ReplayResponse(interaction)
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
@@ -7,7 +7,7 @@ import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
@@ -17,8 +17,44 @@ from .const import (
     CONF_EMAIL,
     CONF_PASSWORD,
     CONF_HIDS,
+    CONF_HUB_SCAN_INTERVALS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUEST_TIMEOUT,
+    CONF_MAX_RETRIES,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_MAX_REQUESTS_PER_MINUTE,
+    CONF_TRACE_ENABLED,
+    CONF_TRACE_SAMPLE_PERCENT,
+    CONF_TRACE_MIDS,
+    CONF_TRACE_ADDRS,
+    CONF_TRACE_MODELS,
+    CONF_RECORD_CASSETTE,
+    CONF_DEDICATED_CONNECTION,
+    CONF_CONNECTION_LIMIT_PER_HOST,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_DNS_CACHE_TTL,
+    CONF_HTTP_COMPRESSION,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DEFAULT_MAX_REQUESTS_PER_MINUTE,
+    DEFAULT_TRACE_ENABLED,
+    DEFAULT_TRACE_SAMPLE_PERCENT,
+    DEFAULT_RECORD_CASSETTE,
+    DEFAULT_DEDICATED_CONNECTION,
+    DEFAULT_CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_DNS_CACHE_TTL,
+    DEFAULT_HTTP_COMPRESSION,
+    MIN_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
 )
 from .homgar_api import HomGarClient, HomGarApiError
+from .tracing import parse_filter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +64,11 @@ class HomGarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> HomGarOptionsFlow:
+        return HomGarOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         errors: dict[str, str] = {}
 
@@ -117,4 +158,139 @@ class HomGarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="select_homes",
             data_schema=data_schema,
             errors=errors,
-        )
\ No newline at end of file
+        )
+
+
+def _int_list(value: str) -> str:
+    """Validate a comma separated list of integers (trace filters)."""
+    try:
+        parse_filter(value, int)
+    except ValueError as err:
+        raise vol.Invalid("Expected comma separated numbers") from err
+    return value
+
+
+class HomGarOptionsFlow(config_entries.OptionsFlow):
+    """Polling options, including a poll interval per hub."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        options = self._entry.options
+        intervals: dict[str, int] = options.get(CONF_HUB_SCAN_INTERVALS, {})
+
+        # Hub fields are labelled by hub name; the label maps back to the mid
+        runtime = self.hass.data.get(DOMAIN, {}).get(self._entry.entry_id)
+        hubs = runtime["account"].hubs if runtime else {}
+        hub_fields = {
+            f"{hub.get('name', 'Hub')} ({mid})": str(mid) for mid, hub in hubs.items()
+        }
+
+        if user_input is not None:
+            return self.async_create_entry(
+                title="",
+                data={
+                    CONF_ADAPTIVE_POLLING: user_input[CONF_ADAPTIVE_POLLING],
+                    CONF_MAX_CONCURRENT_REQUESTS: user_input[CONF_MAX_CONCURRENT_REQUESTS],
+                    CONF_REQUEST_TIMEOUT: user_input[CONF_REQUEST_TIMEOUT],
+                    CONF_MAX_RETRIES: user_input[CONF_MAX_RETRIES],
+                    CONF_MAX_REQUESTS_PER_SECOND: user_input[CONF_MAX_REQUESTS_PER_SECOND],
+                    CONF_MAX_REQUESTS_PER_MINUTE: user_input[CONF_MAX_REQUESTS_PER_MINUTE],
+                    CONF_DEDICATED_CONNECTION: user_input[CONF_DEDICATED_CONNECTION],
+                    CONF_CONNECTION_LIMIT_PER_HOST: user_input[CONF_CONNECTION_LIMIT_PER_HOST],
+                    CONF_KEEPALIVE_TIMEOUT: user_input[CONF_KEEPALIVE_TIMEOUT],
+                    CONF_DNS_CACHE_TTL: user_input[CONF_DNS_CACHE_TTL],
+                    CONF_HTTP_COMPRESSION: user_input[CONF_HTTP_COMPRESSION],
+                    CONF_TRACE_ENABLED: user_input[CONF_TRACE_ENABLED],
+                    CONF_TRACE_SAMPLE_PERCENT: user_input[CONF_TRACE_SAMPLE_PERCENT],
+                    CONF_TRACE_MIDS: user_input.get(CONF_TRACE_MIDS, ""),
+                    CONF_TRACE_ADDRS: user_input.get(CONF_TRACE_ADDRS, ""),
+                    CONF_TRACE_MODELS: user_input.get(CONF_TRACE_MODELS, ""),
+                    CONF_RECORD_CASSETTE: user_input[CONF_RECORD_CASSETTE],
+                    CONF_HUB_SCAN_INTERVALS: {
+                        **intervals,
+                        **{mid: user_input[label] for label, mid in hub_fields.items()},
+                    },
+                },
+            )
+
+        schema: dict[Any, Any] = {
+            vol.Required(
+                CONF_ADAPTIVE_POLLING,
+                default=options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+            ): bool,
+            vol.Required(
+                CONF_MAX_CONCURRENT_REQUESTS,
+                default=options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+            vol.Required(
+                CONF_REQUEST_TIMEOUT,
+                default=options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=120)),
+            vol.Required(
+                CONF_MAX_RETRIES,
+                default=options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+            vol.Required(
+                CONF_MAX_REQUESTS_PER_SECOND,
+                default=options.get(CONF_MAX_REQUESTS_PER_SECOND, DEFAULT_MAX_REQUESTS_PER_SECOND),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+            vol.Required(
+                CONF_MAX_REQUESTS_PER_MINUTE,
+                default=options.get(CONF_MAX_REQUESTS_PER_MINUTE, DEFAULT_MAX_REQUESTS_PER_MINUTE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3000)),
+            vol.Required(
+                CONF_DEDICATED_CONNECTION,
+                default=options.get(CONF_DEDICATED_CONNECTION, DEFAULT_DEDICATED_CONNECTION),
+            ): bool,
+            vol.Required(
+                CONF_CONNECTION_LIMIT_PER_HOST,
+                default=options.get(CONF_CONNECTION_LIMIT_PER_HOST, DEFAULT_CONNECTION_LIMIT_PER_HOST),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+            vol.Required(
+                CONF_KEEPALIVE_TIMEOUT,
+                default=options.get(CONF_KEEPALIVE_TIMEOUT, DEFAULT_KEEPALIVE_TIMEOUT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Required(
+                CONF_DNS_CACHE_TTL,
+                default=options.get(CONF_DNS_CACHE_TTL, DEFAULT_DNS_CACHE_TTL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            vol.Required(
+                CONF_HTTP_COMPRESSION,
+                default=options.get(CONF_HTTP_COMPRESSION, DEFAULT_HTTP_COMPRESSION),
+            ): bool,
+            vol.Required(
+                CONF_TRACE_ENABLED,
+                default=options.get(CONF_TRACE_ENABLED, DEFAULT_TRACE_ENABLED),
+            ): bool,
+            vol.Required(
+                CONF_TRACE_SAMPLE_PERCENT,
+                default=options.get(CONF_TRACE_SAMPLE_PERCENT, DEFAULT_TRACE_SAMPLE_PERCENT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+            vol.Optional(
+                CONF_TRACE_MIDS,
+                description={"suggested_value": options.get(CONF_TRACE_MIDS, "")},
+            ): _int_list,
+            vol.Optional(
+                CONF_TRACE_ADDRS,
+                description={"suggested_value": options.get(CONF_TRACE_ADDRS, "")},
+            ): _int_list,
+            vol.Optional(
+                CONF_TRACE_MODELS,
+                description={"suggested_value": options.get(CONF_TRACE_MODELS, "")},
+            ): str,
+            vol.Required(
+                CONF_RECORD_CASSETTE,
+                default=options.get(CONF_RECORD_CASSETTE, DEFAULT_RECORD_CASSETTE),
+            ): bool,
+        }
+        for label, mid in hub_fields.items():
+            schema[vol.Required(label, default=intervals.get(mid, DEFAULT_SCAN_INTERVAL))] = vol.All(
+                vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)
+            )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(schema),
+        )
@@ -7,11 +7,97 @@ CONF_PASSWORD = "password"
 CONF_HIDS = "hids"  # list of selected home IDs
 
 DEFAULT_SCAN_INTERVAL = 120  # seconds
+MIN_SCAN_INTERVAL = 15  # seconds
+MAX_SCAN_INTERVAL = 3600  # seconds
+
+# Options: per-hub poll interval, {str(mid): seconds}
+CONF_HUB_SCAN_INTERVALS = "hub_scan_intervals"
+
+# Poll fan-out
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUEST_TIMEOUT = "request_timeout"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_REQUEST_TIMEOUT = 30  # seconds, per API request attempt
+
+# Retries of idempotent GETs on 5xx/429, connection errors and timeouts
+CONF_MAX_RETRIES = "max_retries"
+DEFAULT_MAX_RETRIES = 2
+RETRY_BACKOFF_BASE = 1.0  # seconds, doubled per attempt with full jitter
+RETRY_BACKOFF_MAX = 10.0  # seconds; a longer Retry-After is not waited for
+# Circuit breaker: after this many consecutive failures calls fail fast,
+# until one probe request is let through after the reset timeout
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60  # seconds
+
+# Request budget shared by all hubs of an account; excess requests queue
+CONF_MAX_REQUESTS_PER_SECOND = "max_requests_per_second"
+CONF_MAX_REQUESTS_PER_MINUTE = "max_requests_per_minute"
+DEFAULT_MAX_REQUESTS_PER_SECOND = 4
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 120
+
+# HTTP connection tuning (dedicated connector owned by the client)
+CONF_DEDICATED_CONNECTION = "dedicated_connection"
+CONF_CONNECTION_LIMIT_PER_HOST = "connection_limit_per_host"
+CONF_KEEPALIVE_TIMEOUT = "keepalive_timeout"
+CONF_DNS_CACHE_TTL = "dns_cache_ttl"
+CONF_HTTP_COMPRESSION = "http_compression"
+DEFAULT_DEDICATED_CONNECTION = False
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 4
+DEFAULT_KEEPALIVE_TIMEOUT = 150  # seconds, longer than a poll interval so connections survive between polls
+DEFAULT_DNS_CACHE_TTL = 300  # seconds
+DEFAULT_HTTP_COMPRESSION = True
+
+# Last topology and readings are stored so setup can create entities without the cloud
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # seconds
+
+# Hub/sub-device topology rarely changes; re-fetch it on a slow cadence
+TOPOLOGY_REFRESH_INTERVAL = 3600  # seconds
+# After a failed refresh the cached topology is kept and the refresh retried this much later
+TOPOLOGY_RETRY_DELAY = 300  # seconds
+
+# Adaptive polling: follow each hub's observed report cadence
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = True
+ADAPTIVE_MAX_INTERVAL = 600  # seconds, unless the configured interval is longer
+ADAPTIVE_ACTIVE_FLOW_INTERVAL = 15  # seconds, while a flowmeter reports usage
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+ADAPTIVE_REPORT_GRACE = 5  # seconds after the expected report before polling
+
+# Payload tracing (off by default); filters are comma separated lists, empty = all
+CONF_TRACE_ENABLED = "trace_enabled"
+CONF_TRACE_SAMPLE_PERCENT = "trace_sample_percent"
+CONF_TRACE_MIDS = "trace_mids"
+CONF_TRACE_ADDRS = "trace_addrs"
+CONF_TRACE_MODELS = "trace_models"
+DEFAULT_TRACE_ENABLED = False
+DEFAULT_TRACE_SAMPLE_PERCENT = 100
+TRACE_BUFFER_SIZE = 200  # records kept for the diagnostics download
+
+# Session recording (off by default): redacted request/response pairs saved as a cassette for offline replay
+CONF_RECORD_CASSETTE = "record_cassette"
+DEFAULT_RECORD_CASSETTE = False
+CASSETTE_DIR = "homgar_cassettes"  # under the Home Assistant config directory
+CASSETTE_MAX_INTERACTIONS = 5000
+
+# Latency windows behind the diagnostic timing sensors
+TIMING_WINDOW_SIZE = 100  # samples per window
+
+# Diagnostics download
+POLL_HISTORY_SIZE = 20  # phase timings kept per hub
+DIAGNOSTICS_PAYLOAD_SAMPLES = 3  # raw sub-device payloads per model
 
 # Config entry data keys
 CONF_TOKEN = "token"
 CONF_REFRESH_TOKEN = "refresh_token"
 CONF_TOKEN_EXPIRES_AT = "token_expires_at"
+TOKEN_PERSIST_DELAY = 10  # seconds; debounces config entry writes after a token refresh
+# Background renewal runs this long before expiry, ahead of the 5 minute window polls renew in
+TOKEN_RENEW_AHEAD = 600  # seconds
+TOKEN_RENEW_RETRY = 60  # seconds before the first background retry; doubles with each failure
+TOKEN_RENEW_RETRY_MAX = 1800  # seconds
+# Rejected refreshes in a row, each followed by a working login, before refresh is given up
+TOKEN_REFRESH_MAX_REJECTIONS = 2
 
 # Known models
 MODEL_MOISTURE_SIMPLE = "HCS026FRF"  # Moisture only
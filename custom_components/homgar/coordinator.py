@@ -1,147 +1,565 @@
+import asyncio
 import logging
-from datetime import timedelta
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping
 
-from homeassistant.core import HomeAssistant
+import aiohttp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
 from .const import (
+    DOMAIN,
     DEFAULT_SCAN_INTERVAL,
     CONF_HIDS,
-    MODEL_MOISTURE_SIMPLE,
-    MODEL_MOISTURE_FULL,
-    MODEL_RAIN,
-    MODEL_TEMPHUM,
+    CONF_HUB_SCAN_INTERVALS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    TOPOLOGY_REFRESH_INTERVAL,
+    TOPOLOGY_RETRY_DELAY,
+    TOKEN_PERSIST_DELAY,
+    STORAGE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
     MODEL_FLOWMETER,
-    MODEL_CO2,
-    MODEL_POOL,
-    MODEL_DISPLAY_HUB,
-)
-from .homgar_api import (
-    HomGarClient, HomGarApiError,
-    decode_moisture_simple, decode_moisture_full, decode_rain,
-    decode_temphum, decode_flowmeter, decode_co2, decode_pool,
-    decode_hws019wrf_v2,
+    POLL_HISTORY_SIZE,
 )
+from .homgar_api import HomGarClient, HomGarApiError, DECODERS, READING_TYPES, Reading
+from .scheduler import AdaptivePollSchedule
+from .timing import LATENCY_DECODE, LATENCY_DISPATCH, LATENCY_POLL, LatencyWindow
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class HomGarCoordinator(DataUpdateCoordinator):
-    """Coordinator for HomGar polling."""
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Store holding the last topology and readings of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
 
-    def __init__(self, hass: HomeAssistant, client: HomGarClient, entry):
-        super().__init__(
+
+@dataclass(slots=True)
+class SensorEntry:
+    """One sub-device of a hub and its latest reading.
+
+    value and time come from the hub's subDeviceStatus entry; data is None
+    when the sub-device reported nothing or its payload could not be decoded.
+    A new entry is built only when the reading changes.
+    """
+
+    hid: int
+    mid: int
+    addr: int
+    home_name: str | None
+    hub_name: str
+    sub_name: str | None
+    model: str | None
+    value: str | None
+    time: int | None
+    data: Reading | None
+
+    def as_dict(self) -> dict[str, Any]:
+        out = {f.name: getattr(self, f.name) for f in fields(self)}
+        out["data"] = self.data.as_dict() if self.data is not None else None
+        return out
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, Any]) -> "SensorEntry":
+        data = stored.get("data")
+        reading_cls = READING_TYPES.get(data["type"]) if data else None
+        return cls(**{
+            **stored,
+            "data": reading_cls.from_dict(data) if reading_cls else None,
+        })
+
+
+@dataclass(slots=True)
+class PollProfile:
+    """Phase timings of one hub poll in ms; failed polls only have total_ms and error."""
+
+    at: float  # epoch seconds
+    total_ms: float
+    fetch_ms: float | None = None
+    decode_ms: float | None = None
+    dispatch_ms: float | None = None
+    sub_devices: int | None = None
+    changed: int | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        out = {f.name: getattr(self, f.name) for f in fields(self)}
+        out["at"] = datetime.fromtimestamp(self.at, tz=timezone.utc).isoformat()
+        for key in ("total_ms", "fetch_ms", "decode_ms", "dispatch_ms"):
+            if out[key] is not None:
+                out[key] = round(out[key], 3)
+        return out
+
+
+class HomGarAccount:
+    """State shared by all hub coordinators of one config entry.
+
+    Owns the client, the in-flight request limit and the cached
+    hub/sub-device topology from getDeviceByHid.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: HomGarClient, entry: ConfigEntry) -> None:
+        self.hass = hass
+        self.client = client
+        self._entry = entry
+        self._hids = entry.data.get(CONF_HIDS, [])
+
+        options = entry.options
+        # Bounds the number of in-flight API requests across all hubs
+        self._semaphore = asyncio.Semaphore(
+            options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS)
+        )
+
+        # Cached topology: mid -> hub (with "hid" added) and mid -> addr -> subDevice
+        self.hubs: dict[int, dict] = {}
+        self.addr_maps: dict[int, dict[int, dict]] = {}
+        self.topology_fetched_at: float | None = None  # monotonic; None until fetched from the cloud
+        # (mid, addr) pairs still missing after a topology refresh; cleared on the next scheduled refresh
+        self.unresolved_addrs: set[tuple[int, int]] = set()
+        self._topology_lock = asyncio.Lock()
+
+        # Hub coordinators by mid, set up by async_setup_entry
+        self.coordinators: dict[int, HomGarCoordinator] = {}
+        self._store = snapshot_store(hass, entry.entry_id)
+
+        # Tokens renewed at runtime are written back so restarts can skip the login
+        self._token_debouncer = Debouncer(
             hass,
             _LOGGER,
-            name="HomGar coordinator",
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            cooldown=TOKEN_PERSIST_DELAY,
+            immediate=False,
+            function=self._async_persist_tokens,
+        )
+
+    def _tokens_changed(self) -> bool:
+        data = self._entry.data
+        return any(data.get(key) != value for key, value in self.client.export_tokens().items())
+
+    async def async_check_tokens(self) -> None:
+        """Schedule a debounced config entry write if the client's tokens changed."""
+        if self._tokens_changed():
+            await self._token_debouncer.async_call()
+
+    @callback
+    def _async_persist_tokens(self) -> None:
+        if not self._tokens_changed():
+            return
+        _LOGGER.debug("Persisting refreshed HomGar token")
+        self.hass.config_entries.async_update_entry(
+            self._entry, data={**self._entry.data, **self.client.export_tokens()}
         )
-        self._client = client
-        self._entry = entry
-        self._hids = entry.data.get(CONF_HIDS, [])
 
-    async def _async_update_data(self):
-        """Fetch and decode data from HomGar."""
+    @callback
+    def async_shutdown(self) -> None:
+        """Flush a pending token write and stop the debouncer."""
+        self._async_persist_tokens()
+        self._token_debouncer.async_shutdown()
+
+    async def limited(self, coro):
+        """Run an API call under the concurrency limit.
+
+        The client applies the request timeout to each attempt, so retries
+        are not cut short by a timeout around the whole call.
+        """
+        async with self._semaphore:
+            return await coro
+
+    async def async_ensure_topology(self) -> None:
+        """Refresh the topology when it is missing or older than the refresh interval.
+
+        A failed refresh keeps the cached topology; it only raises when
+        there is none to fall back on.
+        """
+        fetched_at = self.topology_fetched_at
+        if fetched_at is not None and time.monotonic() - fetched_at < TOPOLOGY_REFRESH_INTERVAL:
+            return
         try:
+            await self.async_refresh_topology(fetched_at, scheduled=True)
+        except (HomGarApiError, aiohttp.ClientError, TimeoutError) as err:
+            if not self.hubs:
+                raise
+            _LOGGER.warning("Failed to refresh HomGar topology, keeping the cached one: %r", err)
+
+    async def async_refresh_topology(self, fetched_at: float | None, scheduled: bool = False) -> None:
+        """Fetch the hub/sub-device topology for all selected homes.
+
+        Callers pass the topology_fetched_at they saw before asking, None
+        included, so when several hubs ask at once only the first one
+        re-fetches and the others use its result.
+        """
+        async with self._topology_lock:
+            if self.topology_fetched_at != fetched_at:
+                return
+
             homes = self._hids
-            hubs: list[dict] = []
-            for hid in homes:
-                devices = await self._client.get_devices_by_hid(hid)
+            try:
+                device_lists = await asyncio.gather(
+                    *(self.limited(self.client.get_devices_by_hid(hid)) for hid in homes)
+                )
+            except (HomGarApiError, aiohttp.ClientError, TimeoutError):
+                if self.hubs:
+                    # Hubs waiting on the lock see the new value and skip their attempt; retry later
+                    self.topology_fetched_at = time.monotonic() - TOPOLOGY_REFRESH_INTERVAL + TOPOLOGY_RETRY_DELAY
+                raise
+            hubs: dict[int, dict] = {}
+            for hid, devices in zip(homes, device_lists):
                 for hub in devices:
                     hub_copy = dict(hub)
                     hub_copy["hid"] = hid
-                    hubs.append(hub_copy)
-
-            status_by_mid: dict[int, dict] = {}
-            decoded_sensors: dict[str, dict] = {}
-
-            for hub in hubs:
-                mid = hub["mid"]
-                status = await self._client.get_device_status(mid)
-                status_by_mid[mid] = status
-
-                _LOGGER.debug("Fetched status for mid=%s: %s", mid, status)
-
-                sub_status = {s["id"]: s for s in status.get("subDeviceStatus", [])}
-
-                # Map addr -> subDevice
-                addr_map = {sd["addr"]: sd for sd in hub.get("subDevices", [])}
-
-                for sid, s in sub_status.items():
-                    if not sid.startswith("D"):
-                        continue
-                    addr_str = sid[1:]
-                    try:
-                        addr = int(addr_str)
-                    except ValueError:
-                        continue
-
-                    sub = addr_map.get(addr)
-                    if not sub:
-                        continue
-
-                    raw_value = s.get("value")
-                    if not raw_value:
-                        # No reading / offline
-                        decoded = None
-                        _LOGGER.debug("No raw_value for mid=%s addr=%s (sid=%s)", mid, addr, sid)
-                    else:
-                        model = sub.get("model")
-                        try:
-                            _LOGGER.debug("Decoding payload for model=%s mid=%s addr=%s: %s", model, mid, addr, raw_value)
-                            if model == MODEL_MOISTURE_SIMPLE:
-                                decoded = decode_moisture_simple(raw_value)
-                            elif model == MODEL_MOISTURE_FULL:
-                                decoded = decode_moisture_full(raw_value)
-                            elif model == MODEL_RAIN:
-                                decoded = decode_rain(raw_value)
-                            elif model == MODEL_TEMPHUM:
-                                decoded = decode_temphum(raw_value)
-                            elif model == MODEL_FLOWMETER:
-                                decoded = decode_flowmeter(raw_value)
-                            elif model == MODEL_CO2:
-                                decoded = decode_co2(raw_value)
-                            elif model == MODEL_POOL:
-                                decoded = decode_pool(raw_value)
-                            elif model == MODEL_DISPLAY_HUB:
-                                decoded = decode_hws019wrf_v2(raw_value)
-                            else:
-                                decoded = None
-                                _LOGGER.warning("Unknown/unsupported model=%s for mid=%s addr=%s, raw_value=%s", model, mid, addr, raw_value)
-                            _LOGGER.debug("Decoded data for mid=%s addr=%s: %s", mid, addr, decoded)
-                        except Exception as ex:  # noqa: BLE001
-                            _LOGGER.warning(
-                                "Failed to decode payload for %s addr=%s: %s",
-                                model,
-                                addr,
-                                ex,
-                            )
-                            decoded = None
-
-                    sensor_key = f"{hub['hid']}_{mid}_{addr}"
-                    decoded_sensors[sensor_key] = {
-                        "hid": hub["hid"],
-                        "mid": mid,
-                        "addr": addr,
-                        "home_name": hub.get("homeName"),  # may not be present
-                        "hub_name": hub.get("name", "Hub"),
-                        "sub_name": sub.get("name"),
-                        "model": sub.get("model"),
-                        "raw_status": s,
-                        "data": decoded,
-                    }
-
-                    _LOGGER.debug("Sensor entity key=%s info=%s", sensor_key, decoded_sensors[sensor_key])
-
-            return {
-                "hubs": hubs,
-                "status": status_by_mid,
-                "sensors": decoded_sensors,
+                    hubs[hub["mid"]] = hub_copy
+
+            old_mids = set(self.hubs)
+            self._set_topology(hubs)
+            self.topology_fetched_at = time.monotonic()
+            if scheduled:
+                self.unresolved_addrs.clear()
+            _LOGGER.debug("Refreshed HomGar topology: %s hubs", len(hubs))
+
+            if old_mids and old_mids != set(hubs):
+                # Hub coordinators are created per mid at setup. The new hub list is stored
+                # first, or the reload would restore the old one and reload again.
+                _LOGGER.info("HomGar hubs changed, reloading %s", self._entry.title)
+                await self._store.async_save(self._snapshot())
+                self.hass.config_entries.async_schedule_reload(self._entry.entry_id)
+
+    def _set_topology(self, hubs: dict[int, dict]) -> None:
+        self.hubs = hubs
+        self.addr_maps = {
+            mid: {sd["addr"]: sd for sd in hub.get("subDevices", [])}
+            for mid, hub in hubs.items()
+        }
+
+    # --- persisted snapshot ---
+
+    async def async_load_snapshot(self) -> dict[int, dict[str, SensorEntry]] | None:
+        """Restore the stored topology; returns the stored sensors per mid, if any.
+
+        The restored topology counts as stale, so the first poll re-fetches it.
+        """
+        stored = await self._store.async_load()
+        if not stored or not stored.get("hubs"):
+            return None
+        try:
+            sensors = {
+                int(mid): {key: SensorEntry.from_dict(entry) for key, entry in hub_sensors.items()}
+                for mid, hub_sensors in stored.get("sensors", {}).items()
             }
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring unreadable HomGar snapshot: %r", err)
+            return None
+        self._set_topology({int(mid): hub for mid, hub in stored["hubs"].items()})
+        return sensors
+
+    @callback
+    def async_schedule_snapshot_save(self) -> None:
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot(self) -> dict:
+        """JSON-safe topology and last readings of every hub."""
+        return {
+            "hubs": {str(mid): hub for mid, hub in self.hubs.items()},
+            "sensors": {
+                str(mid): {key: entry.as_dict() for key, entry in coordinator.data.items()}
+                for mid, coordinator in self.coordinators.items()
+                if coordinator.data
+            },
+        }
+
+    def remember_unresolved(self, mid: int, status: dict) -> None:
+        """Stop refreshing topology for ids the cloud still does not describe."""
+        addr_map = self.addr_maps.get(mid, {})
+        for sid, addr, _s in _iter_sub_status(status):
+            if addr not in addr_map:
+                _LOGGER.debug("No topology entry for mid=%s sid=%s", mid, sid)
+                self.unresolved_addrs.add((mid, addr))
+
+
+class HomGarCoordinator(DataUpdateCoordinator):
+    """Coordinator polling a single HomGar hub (mid)."""
+
+    def __init__(self, hass: HomeAssistant, account: HomGarAccount, entry: ConfigEntry, mid: int):
+        options = entry.options
+        interval = options.get(CONF_HUB_SCAN_INTERVALS, {}).get(str(mid), DEFAULT_SCAN_INTERVAL)
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"HomGar hub {mid}",
+            update_interval=timedelta(seconds=interval),
+        )
+        self._account = account
+        self._client = account.client
+        self._entry = entry
+        self.mid = mid
+
+        # sensor_key -> (raw value, report time, decoded); unchanged readings skip decoding
+        self._decode_memo: dict[str, tuple[str, Any, Reading | None]] = {}
+        self.decode_cache_hits = 0
+        self.decode_cache_misses = 0
+
+        # Sensor keys whose entry differs from the previous poll; entities skip state writes otherwise
+        self.changed_keys: set[str] = set()
+
+        # getDeviceStatus of this hub as the poll sees it: queueing, throttling and retries included
+        self.status_latency = LatencyWindow()
+        # Phase timings of the last polls, for the diagnostics download
+        self.poll_history: deque[PollProfile] = deque(maxlen=POLL_HISTORY_SIZE)
+        self.poll_failures = 0
+
+        self._adaptive = options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        self._schedule = AdaptivePollSchedule(interval)
+
+    @property
+    def decode_memo(self) -> Mapping[str, tuple[str, Any, Reading | None]]:
+        """The decode memo by sensor key, read-only; for diagnostics."""
+        return self._decode_memo
+
+    @callback
+    def async_restore(self, sensors: dict[str, SensorEntry]) -> None:
+        """Seed data and the decode memo from a stored snapshot, before any poll."""
+        self.data = sensors
+        for key, entry in sensors.items():
+            if entry.value:
+                self._decode_memo[key] = (entry.value, entry.time, entry.data)
+
+    async def _async_update_data(self) -> dict[str, SensorEntry]:
+        """Fetch and decode data for this hub, keyed by sensor key."""
+        self.changed_keys = set()
+        previous: dict[str, SensorEntry] = self.data or {}
+        account = self._account
+        latency = self._client.latency
+        poll_started = time.perf_counter()
+        try:
+            await account.async_ensure_topology()
+            hub = account.hubs.get(self.mid)
+            if hub is None:
+                raise UpdateFailed(f"Hub mid={self.mid} is no longer in the selected homes")
+
+            started = time.perf_counter()
+            try:
+                status = await account.limited(self._client.get_device_status(self.mid))
+            finally:
+                fetch_time = time.perf_counter() - started
+                self.status_latency.add(fetch_time)
+
+            decoded_sensors: dict[str, SensorEntry] = {}
+            fetched_at = account.topology_fetched_at
+            started = time.perf_counter()
+            complete = self._decode_hub(hub, status, previous, decoded_sensors)
+            decode_time = time.perf_counter() - started
+            if not complete:
+                # The hub reported sub-devices the cached topology does not know yet
+                try:
+                    await account.async_refresh_topology(fetched_at)
+                except (HomGarApiError, aiohttp.ClientError, TimeoutError) as err:
+                    _LOGGER.warning("Failed to refresh HomGar topology: %r", err)
+                hub = account.hubs.get(self.mid, hub)
+                started = time.perf_counter()
+                if not self._decode_hub(hub, status, previous, decoded_sensors):
+                    account.remember_unresolved(self.mid, status)
+                decode_time += time.perf_counter() - started
+            latency.add(LATENCY_DECODE, decode_time)
+
+            await account.async_check_tokens()
+
+            self.changed_keys = {
+                key for key, info in decoded_sensors.items() if previous.get(key) is not info
+            }
+            self.changed_keys.update(previous.keys() - decoded_sensors.keys())
+            if self.changed_keys:
+                account.async_schedule_snapshot_save()
+
+            if self._adaptive:
+                active = self._has_active_flow(previous, decoded_sensors)
+                self.update_interval = timedelta(seconds=self._schedule.observe(status, active))
+
+            poll_time = time.perf_counter() - poll_started
+            self.poll_history.append(
+                PollProfile(
+                    at=time.time(),
+                    total_ms=poll_time * 1000,
+                    fetch_ms=fetch_time * 1000,
+                    decode_ms=decode_time * 1000,
+                    sub_devices=len(decoded_sensors),
+                    changed=len(self.changed_keys),
+                )
+            )
+            return decoded_sensors
+        except UpdateFailed as err:
+            self._poll_failed(poll_started, err)
+            raise
         except HomGarApiError as err:
+            self._poll_failed(poll_started, err)
             raise UpdateFailed(f"HomGar API error: {err}") from err
+        except TimeoutError as err:
+            self._poll_failed(poll_started, err)
+            raise UpdateFailed("Timed out talking to HomGar") from err
+        except aiohttp.ClientError as err:
+            self._poll_failed(poll_started, err)
+            raise UpdateFailed(f"Error talking to HomGar: {err}") from err
         except Exception as err:  # noqa: BLE001
-            raise UpdateFailed(f"Unexpected HomGar error: {err}") from err
\ No newline at end of file
+            self._poll_failed(poll_started, err)
+            raise UpdateFailed(f"Unexpected HomGar error: {err}") from err
+        finally:
+            # Failed and timed-out polls count too, or the window only shows the fast ones
+            latency.add(LATENCY_POLL, time.perf_counter() - poll_started)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the entities, timing the dispatch."""
+        started = time.perf_counter()
+        super().async_update_listeners()
+        dispatch_time = time.perf_counter() - started
+        self._client.latency.add(LATENCY_DISPATCH, dispatch_time)
+        history = self.poll_history
+        if history and history[-1].dispatch_ms is None:
+            history[-1].dispatch_ms = dispatch_time * 1000
+
+    def _poll_failed(self, poll_started: float, err: Exception) -> None:
+        """Record a failed poll and retry at the configured interval."""
+        self.poll_failures += 1
+        self.poll_history.append(
+            PollProfile(
+                at=time.time(),
+                total_ms=(time.perf_counter() - poll_started) * 1000,
+                error=repr(err),
+            )
+        )
+        if self._adaptive:
+            self.update_interval = timedelta(seconds=self._schedule.failed())
+
+    @staticmethod
+    def _has_active_flow(previous: dict[str, SensorEntry], current: dict[str, SensorEntry]) -> bool:
+        """True if a flowmeter on the hub reported more water or a longer session."""
+        for key, entry in current.items():
+            data = entry.data
+            if entry.model != MODEL_FLOWMETER or data is None:
+                continue
+            prev = previous.get(key)
+            prev_data = prev.data if prev else None
+            if prev_data is None or prev_data is data:
+                continue
+            if (
+                data.flowtotal != prev_data.flowtotal
+                or data.flowcurrenduration != prev_data.flowcurrenduration
+            ):
+                return True
+        return False
+
+    def _decode_hub(
+        self,
+        hub: dict,
+        status: dict,
+        previous: dict[str, SensorEntry],
+        decoded_sensors: dict[str, SensorEntry],
+    ) -> bool:
+        """Decode every sub-device reading reported for one hub.
+
+        Entries whose reading did not change are carried over from previous
+        as the same object, which is how changed_keys detects them.
+
+        Returns False if the status mentions a sub-device missing from the
+        cached topology, so the caller can refresh it.
+        """
+        mid = hub["mid"]
+        addr_map = self._account.addr_maps.get(mid, {})
+        unresolved = self._account.unresolved_addrs
+        tracer = self._client.tracer
+        # Raw payload bytes are only kept on readings while tracing
+        keep_raw = tracer.enabled
+        complete = True
+
+        for sid, addr, s in _iter_sub_status(status):
+            sub = addr_map.get(addr)
+            if not sub:
+                if (mid, addr) not in unresolved:
+                    complete = False
+                continue
+
+            sensor_key = f"{hub['hid']}_{mid}_{addr}"
+            raw_value = s.get("value")
+            report_time = s.get("time")
+            if not raw_value:
+                # No reading / offline
+                decoded = None
+            else:
+                memo = self._decode_memo.get(sensor_key)
+                if memo is not None and memo[0] == raw_value and memo[1] == report_time:
+                    self.decode_cache_hits += 1
+                    decoded = memo[2]
+                else:
+                    self.decode_cache_misses += 1
+                    decoded = self._decode_value(sub.get("model"), mid, addr, raw_value, keep_raw)
+                    self._decode_memo[sensor_key] = (raw_value, report_time, decoded)
+
+            if tracer.enabled and tracer.wants(mid, addr, sub.get("model")):
+                tracer.record(
+                    "reading",
+                    mid=mid,
+                    addr=addr,
+                    model=sub.get("model"),
+                    raw_status=s,
+                    data=decoded.as_dict(raw=True) if decoded is not None else None,
+                )
+
+            prev = previous.get(sensor_key)
+            if prev is not None and prev.data is decoded and prev.time == report_time:
+                decoded_sensors[sensor_key] = prev
+                continue
+
+            decoded_sensors[sensor_key] = SensorEntry(
+                hid=hub["hid"],
+                mid=mid,
+                addr=addr,
+                home_name=hub.get("homeName"),  # may not be present
+                hub_name=hub.get("name", "Hub"),
+                sub_name=sub.get("name"),
+                model=sub.get("model"),
+                value=raw_value,
+                time=report_time,
+                data=decoded,
+            )
+
+        return complete
+
+    @staticmethod
+    def _decode_value(model: str | None, mid: int, addr: int, raw_value: str, keep_raw: bool = False) -> Reading | None:
+        """Decode one raw sub-device value, or None if it cannot be decoded."""
+        try:
+            decoder = DECODERS.get(model)
+            if decoder is None:
+                _LOGGER.warning("Unknown/unsupported model=%s for mid=%s addr=%s, raw_value=%s", model, mid, addr, raw_value)
+                return None
+            return decoder(raw_value, keep_raw)
+        except Exception as ex:  # noqa: BLE001
+            _LOGGER.warning(
+                "Failed to decode payload for %s addr=%s: %s",
+                model,
+                addr,
+                ex,
+            )
+            return None
+
+
+def _iter_sub_status(status: dict):
+    """Yield (sid, addr, sub_status) for every D<addr> entry of a hub status."""
+    sub_status = {s["id"]: s for s in status.get("subDeviceStatus", [])}
+    for sid, s in sub_status.items():
+        if not sid.startswith("D"):
+            continue
+        try:
+            addr = int(sid[1:])
+        except ValueError:
+            continue
+        yield sid, addr, s
+
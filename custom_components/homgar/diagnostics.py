@@ -0,0 +1,127 @@
+import sys
+from collections import deque
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_REFRESH_TOKEN,
+    DIAGNOSTICS_PAYLOAD_SAMPLES,
+)
+
+TO_REDACT = {
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_TOKEN,
+    CONF_REFRESH_TOKEN,
+    "refreshToken",
+    "phoneOrEmail",
+    "mac",
+    "sn",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    client = runtime["client"]
+    account = runtime["account"]
+    coordinators = runtime["coordinators"]
+
+    # Shared objects (e.g. readings also held by the decode memo) are counted once, for the first hub holding them
+    seen: set[int] = set()
+    hubs = {}
+    for mid, coordinator in coordinators.items():
+        data = coordinator.data or {}
+        hubs[str(mid)] = {
+            "name": account.hubs.get(mid, {}).get("name"),
+            "last_update_success": coordinator.last_update_success,
+            "update_interval_s": coordinator.update_interval.total_seconds() if coordinator.update_interval else None,
+            "sub_devices": len(data),
+            "data_bytes": _deep_size(data, seen),
+            "decode_cache": {
+                "hits": coordinator.decode_cache_hits,
+                "misses": coordinator.decode_cache_misses,
+                "memo_entries": len(coordinator.decode_memo),
+                "memo_extra_bytes": _deep_size(coordinator.decode_memo, seen),
+            },
+            "poll_failures": coordinator.poll_failures,
+            "status_latency_ms": coordinator.status_latency.summary(),
+            "polls": [profile.as_dict() for profile in coordinator.poll_history],
+        }
+
+    sub_devices = sum(hub["sub_devices"] for hub in hubs.values())
+    data_bytes = sum(hub["data_bytes"] for hub in hubs.values())
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "client_stats": dict(client.stats),
+        "circuit_breaker": {"state": client.breaker.state, "failures": client.breaker.failures},
+        "latency_ms": client.latency.summary(),
+        "token_history": list(client.token_history),
+        "memory": {
+            "data_bytes": data_bytes,
+            "sub_devices": sub_devices,
+            "bytes_per_sub_device": round(data_bytes / sub_devices) if sub_devices else None,
+        },
+        "hubs": hubs,
+        "unresolved_addrs": sorted(f"{mid}/{addr}" for mid, addr in account.unresolved_addrs),
+        "payload_samples": async_redact_data(_payload_samples(coordinators), TO_REDACT),
+        "trace": async_redact_data(client.tracer.dump(), TO_REDACT),
+    }
+
+
+def _deep_size(obj: Any, seen: set[int]) -> int:
+    """Approximate bytes held by obj and all it references, skipping objects in seen."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return size + sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return size + sum(_deep_size(item, seen) for item in obj)
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if hasattr(obj, name):
+                size += _deep_size(getattr(obj, name), seen)
+    if hasattr(obj, "__dict__"):
+        size += _deep_size(vars(obj), seen)
+    return size
+
+
+def _payload_samples(coordinators: dict) -> dict[str, list[dict]]:
+    """A few distinct raw subDeviceStatus values per model, to reproduce decoding offline.
+
+    Full responses, including entries of unknown sub-devices, are captured
+    by payload tracing.
+    """
+    samples: dict[str, list[dict]] = {}
+    for mid, coordinator in coordinators.items():
+        for entry in (coordinator.data or {}).values():
+            if not entry.value:
+                continue
+            model_samples = samples.setdefault(entry.model or "unknown", [])
+            if len(model_samples) >= DIAGNOSTICS_PAYLOAD_SAMPLES or any(
+                sample["value"] == entry.value for sample in model_samples
+            ):
+                continue
+            model_samples.append(
+                {
+                    "mid": mid,
+                    "addr": entry.addr,
+                    "value": entry.value,
+                    "time": entry.time,
+                    "decoded": entry.data is not None,
+                }
+            )
+    return samples
@@ -1,6 +1,14 @@
+import asyncio
 import hashlib
 import logging
+import random
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass, fields, make_dataclass
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, ClassVar, NamedTuple
 
 import aiohttp
 
@@ -11,7 +19,30 @@ from .const import (
     CONF_TOKEN,
     CONF_TOKEN_EXPIRES_AT,
     CONF_REFRESH_TOKEN,
+    TOKEN_RENEW_AHEAD,
+    TOKEN_RENEW_RETRY,
+    TOKEN_RENEW_RETRY_MAX,
+    TOKEN_REFRESH_MAX_REJECTIONS,
+    DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DEFAULT_MAX_REQUESTS_PER_MINUTE,
+    MODEL_MOISTURE_SIMPLE,
+    MODEL_MOISTURE_FULL,
+    MODEL_RAIN,
+    MODEL_TEMPHUM,
+    MODEL_FLOWMETER,
+    MODEL_CO2,
+    MODEL_POOL,
+    MODEL_DISPLAY_HUB,
 )
+from .cassette import CassetteRecorder, RecordingSession
+from .timing import LATENCY_LOGIN, LATENCY_TOKEN_REFRESH, LatencyRecorder
+from .tracing import PayloadTracer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,18 +51,270 @@ class HomGarApiError(Exception):
     pass
 
 
+class HomGarAuthError(HomGarApiError):
+    """The cloud rejected the token or the login credentials."""
+
+
+class HomGarTransientError(HomGarApiError):
+    """A failure worth retrying (HTTP 5xx or 429)."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class HomGarUnavailableError(HomGarApiError):
+    """The circuit breaker is open, the cloud was not contacted."""
+
+
+# Body codes taken to mean the token is invalid or expired. An assumption: the cloud
+# is seen reusing HTTP 401/403 as "code" values, the full list is not documented.
+AUTH_ERROR_CODES = frozenset({401, 403})
+
+DEFAULT_BASE_URL = "https://region3.homgarus.com"
+LOGIN_PATH = "/auth/basic/app/login"
+# Assumed to mirror the login endpoint. Any answer other than a token rejection or a
+# transient failure disables refresh for the client's lifetime, and so do repeated
+# rejections while the password login keeps working.
+REFRESH_TOKEN_PATH = "/auth/basic/app/refreshToken"
+
+# Errors after which the cloud is considered unhealthy and a GET may be retried
+TRANSIENT_ERRORS = (HomGarTransientError, aiohttp.ClientConnectionError, TimeoutError)
+
+
+def _retry_after(resp: aiohttp.ClientResponse) -> float | None:
+    """Seconds requested by a Retry-After header (delta seconds or HTTP date)."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """Fails calls fast after repeated failures instead of hammering the cloud.
+
+    closed: calls pass, consecutive failures are counted.
+    open: calls raise HomGarUnavailableError until reset_timeout has passed.
+    half_open: one probe call is let through; success closes the circuit,
+    failure opens it again, and a rejected call lets the next probe through.
+    A probe that never reports back (e.g. cancelled) is replaced by a new
+    one after another reset_timeout.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0  # monotonic
+        self._probe_at: float | None = None
+
+    def before_call(self) -> None:
+        if self.state == "closed":
+            return
+        now = time.monotonic()
+        if self.state == "open":
+            if now - self.opened_at < self.reset_timeout:
+                raise HomGarUnavailableError("HomGar cloud circuit open, skipping request")
+            self.state = "half_open"
+            self._probe_at = None
+        if self._probe_at is not None and now - self._probe_at < self.reset_timeout:
+            raise HomGarUnavailableError("HomGar cloud circuit half-open, probe in flight")
+        self._probe_at = now
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probe_at = None
+
+    def release(self) -> None:
+        """The cloud answered but rejected the call: neither a success nor a failure."""
+        self._probe_at = None
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True when this opened the circuit."""
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            opened = self.state != "open"
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probe_at = None
+            return opened
+        return False
+
+
+class TokenBucket:
+    """Refills rate tokens per second up to capacity."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """Refill, then return how long until a token is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class RequestBudget:
+    """Requests-per-second cap and per-minute quota for one account.
+
+    Each is a token bucket; a request needs a token from both. Callers wait
+    in FIFO order (asyncio.Lock is fair), so excess requests are delayed,
+    never dropped.
+    """
+
+    def __init__(self, per_second: float, per_minute: float) -> None:
+        self._buckets = (
+            TokenBucket(per_second, per_second),
+            TokenBucket(per_minute / 60, per_minute),
+        )
+        self._lock = asyncio.Lock()
+        self.waiting = 0
+
+    async def acquire(self) -> float:
+        """Wait for a request slot; returns the seconds spent queued."""
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    wait = max(bucket.wait_time(now) for bucket in self._buckets)
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+                for bucket in self._buckets:
+                    bucket.take()
+        finally:
+            self.waiting -= 1
+        return time.monotonic() - start
+
+
 class HomGarClient:
-    def __init__(self, area_code: str, email: str, password: str, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        area_code: str,
+        email: str,
+        password: str,
+        session: aiohttp.ClientSession,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        max_requests_per_second: float = DEFAULT_MAX_REQUESTS_PER_SECOND,
+        max_requests_per_minute: float = DEFAULT_MAX_REQUESTS_PER_MINUTE,
+        tracer: PayloadTracer | None = None,
+        base_url: str = DEFAULT_BASE_URL,
+    ):
         self._area_code = area_code
         self._email = email
         self._password = password  # cleartext, HA will store
         self._session = session
+        self._owns_session = False
+        self._accept_encoding = "gzip, deflate"
+        self._request_timeout = request_timeout  # per attempt
+        self._max_retries = max_retries
+        self.breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+        # Shared by every coordinator polling through this client
+        self.budget = RequestBudget(max_requests_per_second, max_requests_per_minute)
+        self.tracer = tracer or PayloadTracer()
+        self.recorder: CassetteRecorder | None = None
+        # Response times per endpoint; coordinators add their poll phases
+        self.latency = LatencyRecorder()
+
+        # Counters for diagnostics
+        self.stats: dict[str, int] = {
+            "connections_created": 0,
+            "connections_reused": 0,
+            "logins": 0,
+            "token_refreshes": 0,
+            "token_refresh_failures": 0,
+            "auth_retries": 0,
+            "requests": 0,
+            "request_failures": 0,  # transient: connection errors, timeouts, 429/5xx
+            "auth_failures": 0,  # token rejected after a new login, or login rejected
+            "api_errors": 0,  # other rejections by the cloud
+            "retries": 0,
+            "circuit_opens": 0,
+            "circuit_rejections": 0,
+            "throttled_requests": 0,
+            "throttle_wait_ms": 0,
+            "throttle_wait_max_ms": 0,
+        }
+        # Recent token renewals: {"at", "method", "ok", "expires_in"}
+        self.token_history: deque[dict] = deque(maxlen=20)
+        self._refresh_supported = True
+        self._refresh_rejections = 0  # consecutive rejected refreshes followed by a working login
 
         self._token: str | None = None
         self._refresh_token: str | None = None
         self._token_expires_at: datetime | None = None
-
-        self._base_url = "https://region3.homgarus.com"
+        # In-progress login shared by all callers (single flight)
+        self._login_task: asyncio.Task | None = None
+        self._renewal_task: asyncio.Task | None = None
+
+        self._base_url = base_url
+
+    # --- connection handling ---
+
+    def use_dedicated_session(
+        self,
+        limit_per_host: int,
+        keepalive_timeout: float,
+        dns_cache_ttl: int,
+        compression: bool = True,
+    ) -> None:
+        """Switch to a session whose connector is owned and tuned by the client.
+
+        Connection creation and reuse are counted in stats, which is only
+        possible on a session the client builds itself.
+        """
+        connector = aiohttp.TCPConnector(
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=dns_cache_ttl,
+        )
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        self._session = aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+        self._owns_session = True
+        self._accept_encoding = "gzip, deflate" if compression else "identity"
+
+    def start_recording(self, recorder: CassetteRecorder) -> None:
+        """Record every request and response of this client into a cassette.
+
+        Call after use_dedicated_session, which replaces the session.
+        """
+        self.recorder = recorder
+        self._session = RecordingSession(self._session, recorder)
+
+    async def _on_connection_create_end(self, session, ctx, params) -> None:
+        self.stats["connections_created"] += 1
+
+    async def _on_connection_reuseconn(self, session, ctx, params) -> None:
+        self.stats["connections_reused"] += 1
+
+    async def async_close(self) -> None:
+        """Stop background token renewal and close the session if the client owns it."""
+        self.stop_token_renewal()
+        if self._owns_session:
+            await self._session.close()
 
     # --- token state helpers ---
 
@@ -62,11 +345,136 @@ class HomGarClient:
     async def ensure_logged_in(self) -> None:
         if self._token_valid():
             return
+        await self._renew_single_flight()
+
+    async def _renew_single_flight(self) -> None:
+        # Concurrent callers in the expiry window all await the same renewal
+        task = self._login_task
+        if task is None:
+            task = self._login_task = asyncio.get_running_loop().create_task(self._renew_token())
+            task.add_done_callback(self._login_done)
+        await asyncio.shield(task)
+
+    def _login_done(self, task: asyncio.Task) -> None:
+        self._login_task = None
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled
+            task.exception()
+
+    def start_token_renewal(self) -> None:
+        """Renew the token in the background before polls would have to."""
+        if self._renewal_task is None:
+            self._renewal_task = asyncio.get_running_loop().create_task(self._token_renewal_loop())
+
+    def stop_token_renewal(self) -> None:
+        if self._renewal_task is not None:
+            self._renewal_task.cancel()
+            self._renewal_task = None
+
+    async def _token_renewal_loop(self) -> None:
+        """Renew ahead of expiry; failures back off, a rejected login ends the loop.
+
+        While the circuit breaker is not closed the polls probe the cloud and
+        renew the token themselves, so no extra login attempts are made.
+        """
+        failures = 0
+        while True:
+            if self._token_expires_at is None:
+                delay = TOKEN_RENEW_RETRY
+            else:
+                renew_at = self._token_expires_at - timedelta(seconds=TOKEN_RENEW_AHEAD)
+                delay = (renew_at - datetime.now(timezone.utc)).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if self.breaker.state != "closed":
+                await asyncio.sleep(TOKEN_RENEW_RETRY)
+                continue
+            try:
+                await self._renew_single_flight()
+            except HomGarAuthError as err:
+                # Retrying a rejected password only risks an account lockout
+                _LOGGER.warning("HomGar rejected the login, stopping background token renewal: %s", err)
+                self._renewal_task = None
+                return
+            except (HomGarApiError, aiohttp.ClientError, TimeoutError) as err:
+                failures += 1
+                delay = min(TOKEN_RENEW_RETRY * 2 ** (failures - 1), TOKEN_RENEW_RETRY_MAX)
+                _LOGGER.warning("Background HomGar token renewal failed, retrying in %ss: %s", delay, err)
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+            # Also bounds the loop for tokens living shorter than TOKEN_RENEW_AHEAD
+            await asyncio.sleep(TOKEN_RENEW_RETRY)
+
+    def _invalidate_token(self, token: str | None) -> None:
+        """Force a new login, unless another caller already replaced the token."""
+        if self._token == token:
+            self._token_expires_at = None
+
+    async def _renew_token(self) -> None:
+        """Renew with the refresh token when possible, else log in with the password."""
+        rejected = False
+        if self._refresh_token and self._refresh_supported:
+            try:
+                await self._refresh()
+                self._refresh_rejections = 0
+                return
+            except (HomGarApiError, aiohttp.ClientError) as err:
+                rejected = isinstance(err, HomGarAuthError)
+                self.stats["token_refresh_failures"] += 1
+                self._record_renewal("refresh", False)
+                _LOGGER.debug("HomGar token refresh rejected, falling back to login: %s", err)
         await self._login()
+        if rejected:
+            # The password works but even refresh tokens fresh from a login are turned
+            # down: the guessed endpoint is more likely wrong than the tokens expired
+            self._refresh_rejections += 1
+            if self._refresh_rejections >= TOKEN_REFRESH_MAX_REJECTIONS:
+                _LOGGER.info("HomGar token refresh keeps being rejected, using login from now on")
+                self._refresh_supported = False
+
+    async def _refresh(self) -> None:
+        """Exchange the refresh token for a new token."""
+        url = f"{self._base_url}{REFRESH_TOKEN_PATH}"
+        payload = {"refreshToken": self._refresh_token}
+
+        _LOGGER.debug("HomGar token refresh request for %s", self._email)
+        await self._throttle()
+        self.stats["token_refreshes"] += 1
+
+        headers = {"Content-Type": "application/json", "lang": "en", "appCode": "1", "Accept-Encoding": self._accept_encoding}
+        if self._token:
+            headers["auth"] = self._token
+        with self.latency.measure(LATENCY_TOKEN_REFRESH):
+            async with self._session.post(url, json=payload, headers=headers) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+        if resp.status in (401, 403):
+            raise HomGarAuthError(f"Token refresh HTTP {resp.status}")
+        if resp.status == 429 or resp.status >= 500:
+            raise HomGarTransientError(f"Token refresh HTTP {resp.status}")
+        if resp.status != 200:
+            error = HomGarApiError(f"Token refresh HTTP {resp.status}")
+        elif data.get("code") in AUTH_ERROR_CODES:
+            raise HomGarAuthError(f"Token refresh failed: {data}")
+        elif data.get("code") != 0 or "data" not in data:
+            error = HomGarApiError(f"Token refresh failed: {data}")
+        else:
+            error = None
+        if error is not None:
+            # The endpoint or its request shape is wrong, not the refresh token
+            _LOGGER.info("HomGar token refresh unavailable, using login from now on: %s", error)
+            self._refresh_supported = False
+            raise error
+
+        expires_in = self._store_token(data)
+        self._record_renewal("refresh", True, expires_in)
+        _LOGGER.info("HomGar token refreshed; token expires in %s seconds", expires_in)
 
     async def _login(self) -> None:
         """Login with areaCode/email/password and store token info."""
-        url = f"{self._base_url}/auth/basic/app/login"
+        url = f"{self._base_url}{LOGIN_PATH}"
 
         # Client-side MD5 hashing as per app/Postman flow
         md5 = hashlib.md5(self._password.encode("utf-8")).hexdigest()
@@ -82,18 +490,33 @@ class HomGarClient:
         }
 
         _LOGGER.debug("HomGar login request for %s", self._email)
-
-        async with self._session.post(url, json=payload, headers={"Content-Type": "application/json", "lang": "en", "appCode": "1"}) as resp:
+        await self._throttle()
+        self.stats["logins"] += 1
+
+        try:
+            with self.latency.measure(LATENCY_LOGIN):
+                async with self._session.post(url, json=payload, headers={"Content-Type": "application/json", "lang": "en", "appCode": "1", "Accept-Encoding": self._accept_encoding}) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
             if resp.status != 200:
                 raise HomGarApiError(f"Login HTTP {resp.status}")
-            data = await resp.json()
 
-        if data.get("code") != 0 or "data" not in data:
-            raise HomGarApiError(f"Login failed: {data}")
+            if data.get("code") != 0 or "data" not in data:
+                raise HomGarAuthError(f"Login failed: {data}")
+        except (HomGarApiError, aiohttp.ClientError):
+            self._record_renewal("login", False)
+            raise
 
+        token_expired_secs = self._store_token(data)
+        self._record_renewal("login", True, token_expired_secs)
+
+        _LOGGER.info("HomGar login successful; token expires in %s seconds", token_expired_secs)
+
+    def _store_token(self, data: dict) -> int:
+        """Store token info from a login/refresh response; returns its lifetime in seconds."""
         d = data["data"]
         self._token = d["token"]
-        self._refresh_token = d.get("refreshToken")
+        self._refresh_token = d.get("refreshToken", self._refresh_token)
         token_expired_secs = d.get("tokenExpired", 0)
         ts_server = data.get("ts")  # ms since epoch
         if ts_server:
@@ -101,76 +524,146 @@ class HomGarClient:
         else:
             base = datetime.now(timezone.utc)
         self._token_expires_at = base + timedelta(seconds=token_expired_secs)
-
-        _LOGGER.info("HomGar login successful; token expires in %s seconds", token_expired_secs)
+        return token_expired_secs
+
+    def _record_renewal(self, method: str, ok: bool, expires_in: int | None = None) -> None:
+        self.token_history.append(
+            {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "method": method,
+                "ok": ok,
+                "expires_in": expires_in,
+            }
+        )
 
     def _auth_headers(self) -> dict:
         if not self._token:
             raise HomGarApiError("Token not available")
-        return {"auth": self._token, "lang": "en", "appCode": "1"}
+        return {"auth": self._token, "lang": "en", "appCode": "1", "Accept-Encoding": self._accept_encoding}
 
     # --- API calls ---
 
+    async def _throttle(self) -> None:
+        """Wait for the request budget and account for the time spent queued."""
+        waited_ms = int(await self.budget.acquire() * 1000)
+        if waited_ms:
+            self.stats["throttled_requests"] += 1
+            self.stats["throttle_wait_ms"] += waited_ms
+            self.stats["throttle_wait_max_ms"] = max(self.stats["throttle_wait_max_ms"], waited_ms)
+
+    async def _api_get(self, name: str, path: str, params: dict | None, default: Any) -> Any:
+        """GET an authenticated endpoint and return its data.
+
+        Transient failures are retried with jittered exponential backoff,
+        honouring Retry-After, behind the circuit breaker. Only an answer
+        with code 0 counts as a success for the breaker.
+        """
+        url = f"{self._base_url}{path}"
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except HomGarUnavailableError:
+                self.stats["circuit_rejections"] += 1
+                raise
+            # Fail-fast rejections above do not use up the budget
+            await self._throttle()
+            self.stats["requests"] += 1
+            try:
+                async with asyncio.timeout(self._request_timeout):
+                    result = await self._api_get_once(name, url, params, default)
+            except TRANSIENT_ERRORS as err:
+                self.stats["request_failures"] += 1
+                if self.breaker.record_failure():
+                    self.stats["circuit_opens"] += 1
+                    _LOGGER.warning("HomGar cloud failing, pausing requests for %ss: %s", self.breaker.reset_timeout, err)
+                    raise
+                delay = self._backoff_delay(attempt, getattr(err, "retry_after", None))
+                if attempt >= self._max_retries or delay is None:
+                    raise
+                attempt += 1
+                self.stats["retries"] += 1
+                _LOGGER.debug("%s failed (%s), retry %s in %.1fs", name, err, attempt, delay)
+                await asyncio.sleep(delay)
+                continue
+            except HomGarAuthError:
+                # Token or credentials rejected, which says nothing about the cloud's health
+                self.stats["auth_failures"] += 1
+                self.breaker.release()
+                raise
+            except HomGarApiError:
+                self.stats["api_errors"] += 1
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_after: float | None) -> float | None:
+        """Full-jitter exponential delay, or None if Retry-After asks for more than RETRY_BACKOFF_MAX."""
+        delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2**attempt))
+        if retry_after is not None:
+            if retry_after > RETRY_BACKOFF_MAX:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    async def _api_get_once(self, name: str, url: str, params: dict | None, default: Any) -> Any:
+        """One GET; if the cloud rejects the token, log in again and retry once."""
+        for attempt in (1, 2):
+            await self.ensure_logged_in()
+            token = self._token
+            with self.latency.measure(name):
+                async with self._session.get(url, params=params, headers=self._auth_headers()) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+            if resp.status in (401, 403):
+                error: HomGarApiError = HomGarAuthError(f"{name} HTTP {resp.status}")
+            elif resp.status == 429 or resp.status >= 500:
+                raise HomGarTransientError(f"{name} HTTP {resp.status}", _retry_after(resp))
+            elif resp.status != 200:
+                raise HomGarApiError(f"{name} HTTP {resp.status}")
+            else:
+                tracer = self.tracer
+                if tracer.enabled and tracer.wants(mid=params.get("mid") if params else None):
+                    tracer.record("response", endpoint=name, params=params, data=data)
+                code = data.get("code")
+                if code == 0:
+                    return data.get("data", default)
+                if code in AUTH_ERROR_CODES:
+                    error = HomGarAuthError(f"{name} failed: {data}")
+                else:
+                    raise HomGarApiError(f"{name} failed: {data}")
+
+            if attempt == 2:
+                raise error
+            _LOGGER.debug("%s rejected the token, logging in again", name)
+            self.stats["auth_retries"] += 1
+            self._invalidate_token(token)
+
     async def list_homes(self) -> list[dict]:
-        await self.ensure_logged_in()
-        url = f"{self._base_url}/app/member/appHome/list"
-        _LOGGER.debug("API call: list_homes URL=%s", url)
-        async with self._session.get(url, headers=self._auth_headers()) as resp:
-            if resp.status != 200:
-                raise HomGarApiError(f"list_homes HTTP {resp.status}")
-            data = await resp.json()
-        _LOGGER.debug("API response: list_homes data=%s", data)
-        if data.get("code") != 0:
-            raise HomGarApiError(f"list_homes failed: {data}")
-        return data.get("data", [])
+        return await self._api_get("list_homes", "/app/member/appHome/list", None, [])
 
     async def get_devices_by_hid(self, hid: int) -> list[dict]:
-        await self.ensure_logged_in()
-        url = f"{self._base_url}/app/device/getDeviceByHid"
-        params = {"hid": hid}
-        _LOGGER.debug("API call: get_devices_by_hid URL=%s params=%s", url, params)
-        async with self._session.get(url, params=params, headers=self._auth_headers()) as resp:
-            if resp.status != 200:
-                raise HomGarApiError(f"getDeviceByHid HTTP {resp.status}")
-            data = await resp.json()
-        _LOGGER.debug("API response: get_devices_by_hid data=%s", data)
-        if data.get("code") != 0:
-            raise HomGarApiError(f"getDeviceByHid failed: {data}")
-        return data.get("data", [])
+        return await self._api_get("getDeviceByHid", "/app/device/getDeviceByHid", {"hid": hid}, [])
 
     async def get_device_status(self, mid: int) -> dict:
-        await self.ensure_logged_in()
-        url = f"{self._base_url}/app/device/getDeviceStatus"
-        params = {"mid": mid}
-        _LOGGER.debug("API call: get_device_status URL=%s params=%s", url, params)
-        async with self._session.get(url, params=params, headers=self._auth_headers()) as resp:
-            if resp.status != 200:
-                raise HomGarApiError(f"getDeviceStatus HTTP {resp.status}")
-            data = await resp.json()
-        _LOGGER.debug("API response: get_device_status data=%s", data)
-        if data.get("code") != 0:
-            raise HomGarApiError(f"getDeviceStatus failed: {data}")
-        return data.get("data", {})
+        return await self._api_get("getDeviceStatus", "/app/device/getDeviceStatus", {"mid": mid}, {})
 
 
 # --- Payload decoding helpers ---
 
-def _parse_homgar_payload(raw: str) -> list[int]:
-    """Turn '10#E1...' into [0-255] bytes list."""
+def _parse_homgar_payload(raw: str) -> bytes:
+    """Turn '10#E1...' into the payload bytes.
+
+    Fields are read in place with struct.unpack_from, so the result is never
+    sliced or expanded into a list of ints.
+    """
     if not raw or not raw.startswith("10#"):
         raise ValueError(f"Unexpected payload format: {raw!r}")
-    hex_str = raw[3:]
-    if len(hex_str) % 2 != 0:
-        raise ValueError(f"Hex payload length must be even: {hex_str}")
-    out: list[int] = []
-    for i in range(0, len(hex_str), 2):
-        b = int(hex_str[i : i + 2], 16)
-        out.append(b)
-    return out
-
-
-def _le16(bytes_: list[int], index: int) -> int:
-    return bytes_[index] | (bytes_[index + 1] << 8)
+    if len(raw) % 2 == 0:
+        raise ValueError(f"Hex payload length must be even: {raw[3:]}")
+    return bytes.fromhex(raw[3:])
 
 
 def _f10_to_c(raw_f10: int) -> float:
@@ -178,149 +671,385 @@ def _f10_to_c(raw_f10: int) -> float:
     return (f - 32.0) / 1.8
 
 
-def _le_val(parts) -> int:
-    """Interpret a list of bytes as a little-endian integer (LSB first)."""
-    return int(''.join(f'{x:02x}' for x in reversed(parts)), 16)
+def _battery_percent(raw: int) -> float:
+    return raw / 4095 * 100
 
 
-def decode_moisture_simple(raw: str) -> dict:
-    """
-    Decode HCS026FRF (moisture-only) payload.
-    Layout after '10#':
-    b0 = 0xE1
-    b1 = RSSI (signed int8)
-    b2 = 0x00
-    b3 = 0xDC
-    b4 = 0x01
-    b5 = 0x88  (moisture tag)
-    b6 = moisture % (0-100)
-    b7,b8 = status/battery field
-    """
-    b = _parse_homgar_payload(raw)
-    if len(b) < 9:
-        raise ValueError(f"Moisture simple payload too short: {b}")
-    if b[5] != 0x88:
-        raise ValueError(f"Expected 0x88 moisture tag at b[5], got {b[5]:02x}")
-    rssi = b[1] - 256 if b[1] >= 128 else b[1]
-    moisture = b[6]
-    status_code = (b[7] << 8) | b[8]
-
-    return {
-        "type": "moisture_simple",
-        "rssi_dbm": rssi,
-        "moisture_percent": moisture,
-        "battery_status_code": status_code,
-        "raw_bytes": b,
-    }
-
-
-def decode_moisture_full(raw: str) -> dict:
-    """
-    Decode HCS021FRF (moisture + temp + lux).
-    Layout after '10#':
-    b0 = 0xE1
-    b1 = RSSI (signed)
-    b2 = 0x00
-    b3 = 0xDC
-    b4 = 0x01
-    b5 = 0x85
-    b6,b7 = temp_raw F*10 LE
-    b8     = 0x88  (moisture tag)
-    b9     = moisture %
-    b10    = 0xC6  (lux tag)
-    b11,b12= lux_raw * 10 LE
-    b13    = 0x00
-    b14,b15= 0xFF,0x0F (status/battery)
+def _rssi_from_unsigned(raw: int) -> int:
+    return raw - 256
+
+
+class Field(NamedTuple):
+    """One value in a binary payload.
+
+    fmt is a struct format code ("B", "b", "<H", ">H", "<I") or "<u24" for a
+    3-byte little-endian integer. offset may also be a tuple of byte indices
+    (most significant first) for values scattered across the payload.
+    The raw integer is divided by scale, passed through convert and rounded
+    to ndigits, each step only if set.
     """
-    b = _parse_homgar_payload(raw)
-    if len(b) < 16:
-        raise ValueError(f"Moisture full payload too short: {b}")
-    rssi = b[1] - 256 if b[1] >= 128 else b[1]
-
-    temp_raw_f10 = _le16(b, 6)
-    temp_c = _f10_to_c(temp_raw_f10)
-
-    if b[8] != 0x88:
-        raise ValueError(f"Expected 0x88 moisture tag at b[8], got {b[8]:02x}")
-    moisture = b[9]
-
-    if b[10] != 0xC6:
-        raise ValueError(f"Expected 0xC6 lux tag at b[10], got {b[10]:02x}")
-    lux_raw10 = _le16(b, 11)
-    lux = lux_raw10 / 10.0
-
-    status_code = (b[14] << 8) | b[15]
-
-    return {
-        "type": "moisture_full",
-        "rssi_dbm": rssi,
-        "moisture_percent": moisture,
-        "temperature_c": temp_c,
-        "temperature_f10": temp_raw_f10,
-        "illuminance_lux": lux,
-        "illuminance_raw10": lux_raw10,
-        "battery_status_code": status_code,
-        "raw_bytes": b,
-    }
-
-
-def decode_rain(raw: str) -> dict:
+
+    name: str
+    offset: int | tuple[int, ...]
+    fmt: str = "B"
+    scale: float | None = None
+    convert: Callable[[float], Any] | None = None
+    ndigits: int | None = None
+
+
+class Tag(NamedTuple):
+    """Fixed marker bytes that must be present at an offset."""
+
+    offset: int
+    value: bytes
+
+
+class Reading:
+    """Decoded payload of one sub-device.
+
+    Subclasses are slotted dataclasses, one per model, so a reading holds
+    its values without a per-instance dict. raw_bytes is only kept when the
+    decoder is asked to (payload tracing). "in" tells whether a model has
+    a field.
     """
-    Decode HCS012ARF (rain gauge).
-    Layout after '10#':
-    b0 = 0xE1
-    b1 = 0x00 (seems constant in your samples)
-    b2 = 0x00
-    b3,4 = FD,04 ; b5,b6 = lastHour raw*10 LE
-    b7,8 = FD,05 ; b9,b10 = last24h raw*10 LE
-    b11,12 = FD,06 ; b13,b14 = last7d raw*10 LE
-    b15,16 = DC,01
-    b17 = 0x97 ; b18,b19 = total raw*10 LE
-    b20,b21 = 0x00,0x00
-    b22,b23 = 0xFF,0x0F (status/battery)
-    b24..b27 = tail
+
+    __slots__ = ()
+    type: ClassVar[str]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__dataclass_fields__
+
+    def as_dict(self, raw: bool = False) -> dict[str, Any]:
+        """JSON-safe values; raw_bytes (as hex) only if raw and it was kept."""
+        out: dict[str, Any] = {"type": self.type}
+        for f in fields(self):
+            if f.name != "raw_bytes":
+                out[f.name] = getattr(self, f.name)
+        raw_bytes = getattr(self, "raw_bytes", None)
+        if raw and raw_bytes is not None:
+            out["raw_bytes"] = raw_bytes.hex()
+        return out
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Reading":
+        return cls(**{f.name: data.get(f.name) for f in fields(cls) if f.name != "raw_bytes"})
+
+
+def _reading_class(type_: str, names: tuple[str, ...]) -> type[Reading]:
+    """Build the slotted record class for a layout's fields."""
+    cls_name = "".join(part.title() for part in type_.split("_")) + "Reading"
+    return make_dataclass(
+        cls_name,
+        [(name, Any) for name in names] + [("raw_bytes", bytes | None, None)],
+        bases=(Reading,),
+        namespace={"type": type_},
+        slots=True,
+    )
+
+
+_U24 = struct.Struct("<HB")
+
+
+def _compile_tags(tags: tuple[Tag, ...]) -> tuple[struct.Struct, tuple[bytes, ...], int]:
+    """Build one struct that extracts every tag so they are checked in a single call."""
+    fmt = ""
+    pos = 0
+    for tag in sorted(tags):
+        if tag.offset < pos:
+            raise ValueError(f"Overlapping tags at b[{tag.offset}]")
+        fmt += f"{tag.offset - pos}x{len(tag.value)}s"
+        pos = tag.offset + len(tag.value)
+    return struct.Struct(fmt), tuple(t.value for t in sorted(tags)), pos
+
+
+def _compile_reader(field: Field) -> tuple[int, Callable[[bytes], int]]:
+    """Return (end offset, reader) extracting the raw integer of a field."""
+    offset = field.offset
+    if isinstance(offset, tuple):
+        def read_scattered(buf, _offsets=offset):
+            value = 0
+            for i in _offsets:
+                value = (value << 8) | buf[i]
+            return value
+        return max(offset) + 1, read_scattered
+
+    if field.fmt == "<u24":
+        # struct has no 3-byte code: read low word and high byte in one call
+        unpack_u24 = _U24.unpack_from
+
+        def read_u24(buf, _unpack_from=unpack_u24, _offset=offset):
+            low, high = _unpack_from(buf, _offset)
+            return low | (high << 16)
+        return offset + 3, read_u24
+
+    unpack_from = struct.Struct(field.fmt).unpack_from
+
+    def read_struct(buf, _unpack_from=unpack_from, _offset=offset):
+        return _unpack_from(buf, _offset)[0]
+    return offset + struct.calcsize(field.fmt), read_struct
+
+
+def _compile_field(field: Field) -> tuple[str, int, Callable[[bytes], Any]]:
+    """Fold reader, scaling, conversion and rounding into one callable."""
+    end, read = _compile_reader(field)
+    scale, convert, ndigits = field.scale, field.convert, field.ndigits
+    if scale is None and convert is None and ndigits is None:
+        return field.name, end, read
+
+    def read_value(buf):
+        value = read(buf)
+        if scale is not None:
+            value = value / scale
+        if convert is not None:
+            value = convert(value)
+        if ndigits is not None:
+            value = round(value, ndigits)
+        return value
+    return field.name, end, read_value
+
+
+class PayloadLayout:
+    """Declarative layout of a '10#...' payload, compiled once at import.
+
+    When min_length is set the payload is rejected if shorter; otherwise a
+    field that does not fit in a short payload decodes as None.
     """
-    b = _parse_homgar_payload(raw)
-    if len(b) < 24:
-        raise ValueError(f"Rain payload too short: {b}")
-
-    if not (b[3] == 0xFD and b[4] == 0x04):
-        raise ValueError("Rain payload missing FD 04 at [3:5]")
-    if not (b[7] == 0xFD and b[8] == 0x05):
-        raise ValueError("Rain payload missing FD 05 at [7:9]")
-    if not (b[11] == 0xFD and b[12] == 0x06):
-        raise ValueError("Rain payload missing FD 06 at [11:13]")
-    if b[17] != 0x97:
-        raise ValueError(f"Rain payload missing 0x97 at b[17], got {b[17]:02x}")
-
-    last_hour_raw10 = _le16(b, 5)
-    last_24h_raw10 = _le16(b, 9)
-    last_7d_raw10 = _le16(b, 13)
-    total_raw10 = _le16(b, 18)
-
-    status_code = (b[22] << 8) | b[23]
-
-    return {
-        "type": "rain",
-        "rain_last_hour_mm": last_hour_raw10 / 10.0,
-        "rain_last_24h_mm": last_24h_raw10 / 10.0,
-        "rain_last_7d_mm": last_7d_raw10 / 10.0,
-        "rain_total_mm": total_raw10 / 10.0,
-        "rain_last_hour_raw10": last_hour_raw10,
-        "rain_last_24h_raw10": last_24h_raw10,
-        "rain_last_7d_raw10": last_7d_raw10,
-        "rain_total_raw10": total_raw10,
-        "battery_status_code": status_code,
-        "raw_bytes": b,
-    }
-
-
-def decode_hws019wrf_v2(raw: str) -> dict:
+
+    def __init__(
+        self,
+        type_: str,
+        fields: tuple[Field, ...],
+        tags: tuple[Tag, ...] = (),
+        min_length: int = 0,
+    ) -> None:
+        self.type = type_
+        self.fields = fields
+        self.tags = tags
+        self.min_length = min_length
+        self._readers = tuple(_compile_field(f) for f in fields)
+        # Payloads at least this long carry every field
+        self._full_length = max((end for _name, end, _read in self._readers), default=0)
+        self._tag_struct, self._tag_values, tags_end = _compile_tags(tags)
+        if tags_end > min_length:
+            raise ValueError(f"{type_} layout: tags must lie within min_length")
+        self.record = _reading_class(type_, tuple(f.name for f in fields))
+
+    def decode(self, raw: str, keep_raw: bool = False) -> Reading:
+        b = _parse_homgar_payload(raw)
+        n = len(b)
+        if n < self.min_length:
+            raise ValueError(f"{self.type} payload too short: {n} bytes")
+        if self.tags and self._tag_struct.unpack_from(b) != self._tag_values:
+            for offset, value in self.tags:
+                if b[offset : offset + len(value)] != value:
+                    raise ValueError(
+                        f"{self.type} payload missing {value.hex(' ').upper()} at b[{offset}]"
+                    )
+
+        if n >= self._full_length:
+            values = [read(b) for _name, _end, read in self._readers]
+        else:
+            values = [read(b) if n >= end else None for _name, end, read in self._readers]
+        return self.record(*values, b if keep_raw else None)
+
+
+# HCS026FRF (moisture-only)
+#   b0 = 0xE1, b1 = RSSI (signed), b2 = 0x00, b3,b4 = DC 01
+#   b5 = 0x88 (moisture tag), b6 = moisture % (0-100)
+#   b7,b8 = status/battery field
+MOISTURE_SIMPLE_LAYOUT = PayloadLayout(
+    "moisture_simple",
+    (
+        Field("rssi_dbm", 1, "b"),
+        Field("moisture_percent", 6),
+        Field("battery_status_code", 7, ">H"),
+    ),
+    tags=(Tag(5, b"\x88"),),
+    min_length=9,
+)
+
+# HCS021FRF (moisture + temp + lux)
+#   b0 = 0xE1, b1 = RSSI (signed), b2 = 0x00, b3,b4 = DC 01, b5 = 0x85
+#   b6,b7   = temp_raw F*10 LE
+#   b8      = 0x88 (moisture tag), b9 = moisture %
+#   b10     = 0xC6 (lux tag), b11,b12 = lux_raw * 10 LE
+#   b13     = 0x00, b14,b15 = 0xFF,0x0F (status/battery)
+MOISTURE_FULL_LAYOUT = PayloadLayout(
+    "moisture_full",
+    (
+        Field("rssi_dbm", 1, "b"),
+        Field("moisture_percent", 9),
+        Field("temperature_c", 6, "<H", convert=_f10_to_c),
+        Field("temperature_f10", 6, "<H"),
+        Field("illuminance_lux", 11, "<H", scale=10.0),
+        Field("illuminance_raw10", 11, "<H"),
+        Field("battery_status_code", 14, ">H"),
+    ),
+    tags=(Tag(8, b"\x88"), Tag(10, b"\xc6")),
+    min_length=16,
+)
+
+# HCS012ARF (rain gauge)
+#   b0 = 0xE1, b1,b2 = 0x00
+#   b3,4 = FD,04 ; b5,b6 = lastHour raw*10 LE
+#   b7,8 = FD,05 ; b9,b10 = last24h raw*10 LE
+#   b11,12 = FD,06 ; b13,b14 = last7d raw*10 LE
+#   b15,16 = DC,01
+#   b17 = 0x97 ; b18,b19 = total raw*10 LE
+#   b20,b21 = 0x00,0x00 ; b22,b23 = 0xFF,0x0F (status/battery) ; b24..b27 = tail
+RAIN_LAYOUT = PayloadLayout(
+    "rain",
+    (
+        Field("rain_last_hour_mm", 5, "<H", scale=10.0),
+        Field("rain_last_24h_mm", 9, "<H", scale=10.0),
+        Field("rain_last_7d_mm", 13, "<H", scale=10.0),
+        Field("rain_total_mm", 18, "<H", scale=10.0),
+        Field("rain_last_hour_raw10", 5, "<H"),
+        Field("rain_last_24h_raw10", 9, "<H"),
+        Field("rain_last_7d_raw10", 13, "<H"),
+        Field("rain_total_raw10", 18, "<H"),
+        Field("battery_status_code", 22, ">H"),
+    ),
+    tags=(Tag(3, b"\xfd\x04"), Tag(7, b"\xfd\x05"), Tag(11, b"\xfd\x06"), Tag(17, b"\x97")),
+    min_length=24,
+)
+
+# HCS014ARF (temperature/humidity), derived from the Node-RED decoder:
+# char position c -> byte index (c - 3) / 2.
+#   b[1-2]   : templow    (2-byte LE, F*10 -> °C)
+#   b[3-4]   : temphigh   (2-byte LE, F*10 -> °C)
+#   b[10-11] : tempcurrent (2-byte LE, F*10 -> °C)
+#   b[13]    : humiditycurrent (%)
+#   b[15]    : humiditylow (%)
+#   b[16]    : humidityhigh (%)
+#   b[17-18] : battery (2-byte LE, /4095*100 -> %)
+TEMPHUM_LAYOUT = PayloadLayout(
+    "temphum",
+    (
+        Field("templow", 1, "<H", convert=_f10_to_c, ndigits=2),
+        Field("temphigh", 3, "<H", convert=_f10_to_c, ndigits=2),
+        Field("tempcurrent", 10, "<H", convert=_f10_to_c, ndigits=2),
+        Field("humiditycurrent", 13),
+        Field("humidityhigh", 16),
+        Field("humiditylow", 15),
+        Field("tempbatt", 17, "<H", convert=_battery_percent, ndigits=2),
+    ),
+)
+
+# HCS008FRF (flowmeter)
+#   b[0] 0xE1 marker, b[1] RSSI / counter, b[2] 0x00, b[3-4] FF 0B marker+tag
+#   b[5-8] zeros, b[9-13] DC 01 99 00 00 (counters/version)
+#   b[14-18] 5-byte timestamp 1
+#   b[19] 0xFF, b[20] 0x07 tag,  b[21-23] flowcurrentused (3-byte LE, /10 -> litres)
+#   b[24] 0x00, b[25] 0xAF tag,  b[26-28] flowcurrenduration (3-byte LE, seconds)
+#   b[29] 0x00, b[30] 0x9F tag,  b[31-33] flowlastused (3-byte LE, /10 -> litres)
+#   b[34] 0x00, b[35] 0xFF, b[36] 0x0A tag, b[37-39] flowlastusedduration (3-byte LE, seconds)
+#   b[40] 0x00, b[41] 0xCB tag,  b[42-44] flowtotaltoday (3-byte LE, /10 -> litres)
+#   b[45] 0x00, b[46] 0xB3 tag,  b[47-50] flowtotal (4-byte LE, /10 -> litres)
+#   b[51] 0xFF, b[52-53] battery (2-byte BE, /4095*100 -> %)
+#   b[54-56] 3-byte timestamp 2 tail
+FLOWMETER_LAYOUT = PayloadLayout(
+    "flowmeter",
+    (
+        Field("flowcurrentused", 21, "<u24", scale=10),
+        Field("flowcurrenduration", 26, "<u24"),
+        Field("flowlastused", 31, "<u24", scale=10),
+        Field("flowlastusedduration", 37, "<u24"),
+        Field("flowtotaltoday", 42, "<u24", scale=10),
+        Field("flowtotal", 47, "<I", scale=10),
+        Field("flowbatt", 52, ">H", convert=_battery_percent, ndigits=1),
+    ),
+)
+
+# HCS0530THO (CO2/temp/humidity), derived from the Node-RED decoder.
+#   b[1-2]   : CO2 current (2-byte LE, ppm)
+#   b[15-16] : co2temp (2-byte LE, F*10 -> °C)
+#   b[18]    : co2humidity (%)
+#   b[24-25] : co2low (2-byte LE, ppm)
+#   b[26-27] : co2high (2-byte LE, ppm)
+#   b[28-29] : battery (2-byte LE, /4095*100 -> %)
+#   b[32]    : RSSI (subtract 256 for signed dBm)
+CO2_LAYOUT = PayloadLayout(
+    "co2",
+    (
+        Field("co2", 1, "<H"),
+        Field("co2low", 24, "<H"),
+        Field("co2high", 26, "<H"),
+        Field("co2temp", 15, "<H", convert=_f10_to_c, ndigits=2),
+        Field("co2humidity", 18),
+        Field("co2batt", 28, "<H", convert=_battery_percent, ndigits=2),
+        Field("co2rssi", 32, convert=_rssi_from_unsigned),
+    ),
+)
+
+# HCS0528ARF (pool/temperature), derived from the Node-RED decoder.
+#   b[1-2]   : templow    (2-byte LE, F*10 -> °C)
+#   b[3-4]   : temphigh   (2-byte LE, F*10 -> °C)
+#   b[10-11] : tempcurrent (2-byte LE, F*10 -> °C)
+#   b[13], b[11] : battery (non-sequential per Node-RED, /4095*100 -> %)
+POOL_LAYOUT = PayloadLayout(
+    "pool",
+    (
+        Field("templow", 1, "<H", convert=_f10_to_c, ndigits=2),
+        Field("temphigh", 3, "<H", convert=_f10_to_c, ndigits=2),
+        Field("tempcurrent", 10, "<H", convert=_f10_to_c, ndigits=2),
+        Field("tempbatt", (13, 11), convert=_battery_percent, ndigits=2),
+    ),
+)
+
+
+def decode_moisture_simple(raw: str, keep_raw: bool = False) -> Reading:
+    """Decode HCS026FRF (moisture-only) payload."""
+    return MOISTURE_SIMPLE_LAYOUT.decode(raw, keep_raw)
+
+
+def decode_moisture_full(raw: str, keep_raw: bool = False) -> Reading:
+    """Decode HCS021FRF (moisture + temp + lux) payload."""
+    return MOISTURE_FULL_LAYOUT.decode(raw, keep_raw)
+
+
+def decode_rain(raw: str, keep_raw: bool = False) -> Reading:
+    """Decode HCS012ARF (rain gauge) payload."""
+    return RAIN_LAYOUT.decode(raw, keep_raw)
+
+
+def decode_temphum(raw: str, keep_raw: bool = False) -> Reading:
+    """Decode HCS014ARF (temperature/humidity) payload."""
+    return TEMPHUM_LAYOUT.decode(raw, keep_raw)
+
+
+def decode_flowmeter(raw: str, keep_raw: bool = False) -> Reading:
+    """Decode HCS008FRF (flowmeter) payload."""
+    return FLOWMETER_LAYOUT.decode(raw, keep_raw)
+
+
+def decode_co2(raw: str, keep_raw: bool = False) -> Reading:
+    """Decode HCS0530THO (CO2/temp/humidity) payload."""
+    return CO2_LAYOUT.decode(raw, keep_raw)
+
+
+def decode_pool(raw: str, keep_raw: bool = False) -> Reading:
+    """Decode HCS0528ARF (pool/temperature) payload."""
+    return POOL_LAYOUT.decode(raw, keep_raw)
+
+
+@dataclass(slots=True)
+class DisplayHubReading(Reading):
+    """Decoded HWS019WRF-V2 payload; raw is the payload text when kept."""
+
+    type: ClassVar[str] = "hws019wrf_v2"
+
+    flags: list[int]
+    readings: dict[str, str]
+    raw: str | None = None
+    error: str | None = None
+
+
+def decode_hws019wrf_v2(raw: str, keep_raw: bool = False) -> DisplayHubReading:
     """
     Decode HWS019WRF-V2 (Display Hub) CSV/semicolon payload.
     Example: '1,0,1;788(788/777/1),68(68/64/1),P=9685(9684/9684/1),'
     """
-    _LOGGER.debug("decode_hws019wrf_v2 called with raw: %r", raw)
     try:
         parts = raw.split(';')
         # First part: status flags (e.g., '1,0,1')
@@ -337,179 +1066,35 @@ def decode_hws019wrf_v2(raw: str) -> dict:
                 elif '=' in item:
                     key, val = item.split('=', 1)
                     readings[key.strip()] = val.strip()
-        result = {
-            "type": "hws019wrf_v2",
-            "flags": flags,
-            "readings": readings,
-            "raw": raw,
-        }
-        _LOGGER.debug("decode_hws019wrf_v2 result: %r", result)
-        return result
+        return DisplayHubReading(flags, readings, raw if keep_raw else None)
     except Exception as ex:
         _LOGGER.warning("Failed to decode HWS019WRF-V2 payload: %s (raw: %r)", ex, raw)
-        return {"type": "hws019wrf_v2", "raw": raw, "error": str(ex)}
-
-
-def decode_temphum(raw: str) -> dict:
-    """
-    Decode HCS014ARF (temperature/humidity) payload.
-
-    All byte indices are 0-based after stripping the '10#' prefix.
-    Derived from Node-RED decoder: char position c → byte index (c - 3) / 2.
-
-      b[1-2]   : templow    (2-byte LE, F*10 → °C)
-      b[3-4]   : temphigh   (2-byte LE, F*10 → °C)
-      b[10-11] : tempcurrent (2-byte LE, F*10 → °C)
-      b[13]    : humiditycurrent (%)
-      b[15]    : humiditylow (%)
-      b[16]    : humidityhigh (%)
-      b[17-18] : battery (2-byte LE, /4095*100 → %)
-    """
-    b = _parse_homgar_payload(raw)
-
-    templow = ((_le_val(b[1:3]) / 10) - 32) * (5 / 9) if len(b) >= 3 else None
-    temphigh = ((_le_val(b[3:5]) / 10) - 32) * (5 / 9) if len(b) >= 5 else None
-    tempcurrent = ((_le_val(b[10:12]) / 10) - 32) * (5 / 9) if len(b) >= 12 else None
-    humiditycurrent = b[13] if len(b) > 13 else None
-    humiditylow = b[15] if len(b) > 15 else None
-    humidityhigh = b[16] if len(b) > 16 else None
-    tempbatt = _le_val(b[17:19]) / 4095 * 100 if len(b) >= 19 else None
-
-    return {
-        "type": "temphum",
-        "templow": round(templow, 2) if templow is not None else None,
-        "temphigh": round(temphigh, 2) if temphigh is not None else None,
-        "tempcurrent": round(tempcurrent, 2) if tempcurrent is not None else None,
-        "humiditycurrent": humiditycurrent,
-        "humidityhigh": humidityhigh,
-        "humiditylow": humiditylow,
-        "tempbatt": round(tempbatt, 2) if tempbatt is not None else None,
-        "raw_bytes": b,
-    }
-
-
-def decode_flowmeter(raw: str) -> dict:
-    """
-    Decode HCS008FRF (flowmeter) payload.
-
-    Packet layout (byte indices, 0-based, after stripping '10#' prefix):
-      b[0]       : 0xE1 marker
-      b[1]       : RSSI / counter
-      b[2]       : 0x00
-      b[3-4]     : FF 0B marker+tag
-      b[5-8]     : zeros
-      b[9-13]    : DC 01 99 00 00  (counters/version)
-      b[14-18]   : 5-byte timestamp 1
-      b[19]      : 0xFF marker
-      b[20]      : 0x07 tag (current flow)
-      b[21-23]   : flowcurrentused  (3-byte LE, /10 → litres)
-      b[24]      : 0x00
-      b[25]      : 0xAF tag (current duration)
-      b[26-28]   : flowcurrenduration  (3-byte LE, seconds)
-      b[29]      : 0x00
-      b[30]      : 0x9F tag (last used)
-      b[31-33]   : flowlastused  (3-byte LE, /10 → litres)
-      b[34]      : 0x00
-      b[35]      : 0xFF marker
-      b[36]      : 0x0A tag (last duration)
-      b[37-39]   : flowlastusedduration  (3-byte LE, seconds)
-      b[40]      : 0x00
-      b[41]      : 0xCB tag (total today)
-      b[42-44]   : flowtotaltoday  (3-byte LE, /10 → litres)
-      b[45]      : 0x00
-      b[46]      : 0xB3 tag (total)
-      b[47-50]   : flowtotal  (4-byte LE, /10 → litres)
-      b[51]      : 0xFF marker
-      b[52-53]   : battery  (2-byte BE, /4095*100 → %)
-      b[54-56]   : 3-byte timestamp 2 tail
-    """
-    b = _parse_homgar_payload(raw)
-
-    flowcurrentused = _le_val(b[21:24]) / 10 if len(b) >= 24 else None
-    flowcurrenduration = _le_val(b[26:29]) if len(b) >= 29 else None
-    flowlastused = _le_val(b[31:34]) / 10 if len(b) >= 34 else None
-    flowlastusedduration = _le_val(b[37:40]) if len(b) >= 40 else None
-    flowtotaltoday = _le_val(b[42:45]) / 10 if len(b) >= 45 else None
-    flowtotal = _le_val(b[47:51]) / 10 if len(b) >= 51 else None
-    # Battery is stored big-endian (MSB at lower address)
-    flowbatt = ((b[52] << 8) | b[53]) / 4095 * 100 if len(b) >= 54 else None
-
-    return {
-        "type": "flowmeter",
-        "flowcurrentused": flowcurrentused,
-        "flowcurrenduration": flowcurrenduration,
-        "flowlastused": flowlastused,
-        "flowlastusedduration": flowlastusedduration,
-        "flowtotaltoday": flowtotaltoday,
-        "flowtotal": flowtotal,
-        "flowbatt": round(flowbatt, 1) if flowbatt is not None else None,
-        "raw_bytes": b,
-    }
-
-
-def decode_co2(raw: str) -> dict:
-    """
-    Decode HCS0530THO (CO2/temp/humidity) payload.
-
-    All byte indices are 0-based after stripping the '10#' prefix.
-    Derived from Node-RED decoder: char position c → byte index (c - 3) / 2.
-
-      b[1-2]   : CO2 current (2-byte LE, ppm)
-      b[15-16] : co2temp (2-byte LE, F*10 → °C)
-      b[18]    : co2humidity (%)
-      b[24-25] : co2low (2-byte LE, ppm)
-      b[26-27] : co2high (2-byte LE, ppm)
-      b[28-29] : battery (2-byte LE, /4095*100 → %)
-      b[32]    : RSSI (subtract 256 for signed dBm)
-    """
-    b = _parse_homgar_payload(raw)
-
-    co2 = _le_val(b[1:3]) if len(b) >= 3 else None
-    co2low = _le_val(b[24:26]) if len(b) >= 26 else None
-    co2high = _le_val(b[26:28]) if len(b) >= 28 else None
-    co2temp = (((_le_val(b[15:17]) / 10) - 32) * (5 / 9)) if len(b) >= 17 else None
-    co2humidity = b[18] if len(b) > 18 else None
-    co2batt = _le_val(b[28:30]) / 4095 * 100 if len(b) >= 30 else None
-    co2rssi = b[32] - 256 if len(b) > 32 else None
-
-    return {
-        "type": "co2",
-        "co2": co2,
-        "co2low": co2low,
-        "co2high": co2high,
-        "co2temp": round(co2temp, 2) if co2temp is not None else None,
-        "co2humidity": co2humidity,
-        "co2batt": round(co2batt, 2) if co2batt is not None else None,
-        "co2rssi": co2rssi,
-        "raw_bytes": b,
-    }
-
-
-def decode_pool(raw: str) -> dict:
-    """
-    Decode HCS0528ARF (pool/temperature) payload.
-
-    All byte indices are 0-based after stripping the '10#' prefix.
-    Derived from Node-RED decoder: char position c → byte index (c - 3) / 2.
-
-      b[1-2]   : templow    (2-byte LE, F*10 → °C)
-      b[3-4]   : temphigh   (2-byte LE, F*10 → °C)
-      b[10-11] : tempcurrent (2-byte LE, F*10 → °C)
-      b[13], b[11] : battery (non-sequential per Node-RED, /4095*100 → %)
-    """
-    b = _parse_homgar_payload(raw)
-
-    templow = ((_le_val(b[1:3]) / 10) - 32) * (5 / 9) if len(b) >= 3 else None
-    temphigh = ((_le_val(b[3:5]) / 10) - 32) * (5 / 9) if len(b) >= 5 else None
-    tempcurrent = ((_le_val(b[10:12]) / 10) - 32) * (5 / 9) if len(b) >= 12 else None
-    # Battery uses non-sequential bytes b[13] (high) and b[11] (low) per Node-RED reference
-    tempbatt = ((b[13] << 8) | b[11]) / 4095 * 100 if len(b) >= 14 else None
-
-    return {
-        "type": "pool",
-        "templow": round(templow, 2) if templow is not None else None,
-        "temphigh": round(temphigh, 2) if temphigh is not None else None,
-        "tempcurrent": round(tempcurrent, 2) if tempcurrent is not None else None,
-        "tempbatt": round(tempbatt, 2) if tempbatt is not None else None,
-        "raw_bytes": b,
-    }
+        return DisplayHubReading([], {}, raw, str(ex))
+
+
+# Model -> decoder. Supporting a new binary model only needs a PayloadLayout here.
+DECODERS: dict[str, Callable[[str, bool], Reading]] = {
+    MODEL_MOISTURE_SIMPLE: MOISTURE_SIMPLE_LAYOUT.decode,
+    MODEL_MOISTURE_FULL: MOISTURE_FULL_LAYOUT.decode,
+    MODEL_RAIN: RAIN_LAYOUT.decode,
+    MODEL_TEMPHUM: TEMPHUM_LAYOUT.decode,
+    MODEL_FLOWMETER: FLOWMETER_LAYOUT.decode,
+    MODEL_CO2: CO2_LAYOUT.decode,
+    MODEL_POOL: POOL_LAYOUT.decode,
+    MODEL_DISPLAY_HUB: decode_hws019wrf_v2,
+}
+
+# Reading.type -> record class, to rebuild stored readings
+READING_TYPES: dict[str, type[Reading]] = {
+    layout.record.type: layout.record
+    for layout in (
+        MOISTURE_SIMPLE_LAYOUT,
+        MOISTURE_FULL_LAYOUT,
+        RAIN_LAYOUT,
+        TEMPHUM_LAYOUT,
+        FLOWMETER_LAYOUT,
+        CO2_LAYOUT,
+        POOL_LAYOUT,
+    )
+}
+READING_TYPES[DisplayHubReading.type] = DisplayHubReading
@@ -0,0 +1,70 @@
+import time
+
+from .const import (
+    ADAPTIVE_ACTIVE_FLOW_INTERVAL,
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_REPORT_GRACE,
+)
+
+
+def latest_report_time(status: dict) -> int | None:
+    """Return the newest subDeviceStatus[].time (ms since epoch) of a hub status."""
+    times = [s["time"] for s in status.get("subDeviceStatus", []) if s.get("time")]
+    return max(times) if times else None
+
+
+class AdaptivePollSchedule:
+    """Learns how often one hub reports and decides when to poll it next.
+
+    The report period is a moving average of the deltas between successive
+    subDeviceStatus times. After a fresh report the hub is polled again just
+    after the next one is expected; while flow is active it is polled at a
+    fast fixed interval; when nothing changes the interval backs off. Apart
+    from active flow, it is never polled faster than its configured interval.
+    """
+
+    def __init__(self, base_interval: float) -> None:
+        self.base_interval = base_interval
+        self.interval = base_interval
+        self.report_period: float | None = None
+        self.last_report_ms: int | None = None
+
+    def observe(self, status: dict, active_flow: bool) -> float:
+        """Record a fetched status and return the delay until the next poll."""
+        report_ms = latest_report_time(status)
+        fresh = report_ms is not None and (
+            self.last_report_ms is None or report_ms > self.last_report_ms
+        )
+
+        if fresh and self.last_report_ms is not None:
+            delta = (report_ms - self.last_report_ms) / 1000
+            if self.report_period is None:
+                self.report_period = delta
+            else:
+                self.report_period = 0.7 * self.report_period + 0.3 * delta
+        if fresh:
+            self.last_report_ms = report_ms
+
+        if active_flow:
+            self.interval = ADAPTIVE_ACTIVE_FLOW_INTERVAL
+        elif fresh and self.report_period is not None:
+            # Aim just past the next expected report
+            expected = self.last_report_ms / 1000 + self.report_period
+            self.interval = expected - time.time() + ADAPTIVE_REPORT_GRACE
+            if self.interval <= 0:
+                # Overdue report: fall back to the configured cadence
+                self.interval = self.base_interval
+        elif fresh:
+            self.interval = self.base_interval
+        else:
+            self.interval *= ADAPTIVE_BACKOFF_FACTOR
+
+        lower = ADAPTIVE_ACTIVE_FLOW_INTERVAL if active_flow else self.base_interval
+        self.interval = min(max(self.interval, lower), max(ADAPTIVE_MAX_INTERVAL, self.base_interval))
+        return self.interval
+
+    def failed(self) -> float:
+        """Retry a hub whose poll failed after the base interval."""
+        self.interval = self.base_interval
+        return self.interval
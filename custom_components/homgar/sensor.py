@@ -2,17 +2,22 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable
 
 from datetime import datetime, timezone
 
 from homeassistant.components.sensor import (
     SensorEntity,
+    SensorEntityDescription,
     SensorDeviceClass,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -26,7 +31,18 @@ from .const import (
     MODEL_CO2,
     MODEL_POOL,
 )
-from .coordinator import HomGarCoordinator
+from .coordinator import HomGarCoordinator, SensorEntry
+from .homgar_api import HomGarClient, Reading
+from .timing import (
+    LATENCY_LOGIN,
+    LATENCY_TOKEN_REFRESH,
+    LATENCY_DEVICES,
+    LATENCY_STATUS,
+    LATENCY_DECODE,
+    LATENCY_DISPATCH,
+    LATENCY_POLL,
+    LatencyWindow,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,128 +54,237 @@ def _slugify(text: str) -> str:
     return text.strip("_")
 
 
+def _rounded(field: str, ndigits: int) -> Callable[[Reading], float | None]:
+    """Value accessor rounding a reading field that may be None."""
+    get = attrgetter(field)
+
+    def value(reading: Reading) -> float | None:
+        val = get(reading)
+        return round(val, ndigits) if val is not None else None
+    return value
+
+
+@dataclass(frozen=True, kw_only=True)
+class HomGarSensorEntityDescription(SensorEntityDescription):
+    """Describes one HomGar sensor of a model.
+
+    key is the unique_id suffix and label follows the sub-device name in the
+    entity name. fallback_sub_name replaces a missing sub-device name; where
+    it is None the name is used as is, keeping existing entity names.
+    """
+
+    value_fn: Callable[[Reading], Any]
+    label: str
+    fallback_sub_name: str | None = None
+
+
+def _measurement(
+    key: str,
+    label: str,
+    value_fn: Callable[[Reading], Any],
+    unit: str,
+    device_class: SensorDeviceClass | None = None,
+    state_class: SensorStateClass = SensorStateClass.MEASUREMENT,
+    fallback_sub_name: str | None = None,
+) -> HomGarSensorEntityDescription:
+    return HomGarSensorEntityDescription(
+        key=key,
+        label=label,
+        value_fn=value_fn,
+        native_unit_of_measurement=unit,
+        device_class=device_class,
+        state_class=state_class,
+        fallback_sub_name=fallback_sub_name,
+    )
+
+
+_MOISTURE = _measurement(
+    "moisture_percent", "Moisture Percent", attrgetter("moisture_percent"), "%",
+    SensorDeviceClass.MOISTURE, fallback_sub_name="Sensor",
+)
+
+# Model -> sensors created for each of its sub-devices, in entity order
+SENSOR_DESCRIPTIONS: dict[str, tuple[HomGarSensorEntityDescription, ...]] = {
+    MODEL_MOISTURE_SIMPLE: (_MOISTURE,),
+    MODEL_MOISTURE_FULL: (
+        _MOISTURE,
+        _measurement(
+            "temperature", "Temperature", _rounded("temperature_c", 1), "°C",
+            SensorDeviceClass.TEMPERATURE, fallback_sub_name="Sensor",
+        ),
+        _measurement(
+            "illuminance", "Illuminance", attrgetter("illuminance_lux"), "lx",
+            SensorDeviceClass.ILLUMINANCE, fallback_sub_name="Sensor",
+        ),
+    ),
+    MODEL_RAIN: (
+        _measurement(
+            "rain_last_hour_mm", "Rain (Last Hour)", _rounded("rain_last_hour_mm", 1), "mm",
+            SensorDeviceClass.PRECIPITATION, fallback_sub_name="Rain Sensor",
+        ),
+        _measurement(
+            "rain_last_24h_mm", "Rain (Last 24 Hours)", _rounded("rain_last_24h_mm", 1), "mm",
+            SensorDeviceClass.PRECIPITATION, fallback_sub_name="Rain Sensor",
+        ),
+        _measurement(
+            "rain_last_7d_mm", "Rain (Last 7 Days)", _rounded("rain_last_7d_mm", 1), "mm",
+            SensorDeviceClass.PRECIPITATION, fallback_sub_name="Rain Sensor",
+        ),
+        # All-time cumulative total: TOTAL_INCREASING for proper HA statistics
+        _measurement(
+            "rain_total_mm", "Rain (Total)", _rounded("rain_total_mm", 1), "mm",
+            SensorDeviceClass.PRECIPITATION, SensorStateClass.TOTAL_INCREASING,
+            fallback_sub_name="Rain Sensor",
+        ),
+    ),
+    MODEL_TEMPHUM: (
+        _measurement("temphum_current", "Current Temperature", attrgetter("tempcurrent"), "°C", SensorDeviceClass.TEMPERATURE),
+        _measurement("temphum_high", "High Temperature", attrgetter("temphigh"), "°C", SensorDeviceClass.TEMPERATURE),
+        _measurement("temphum_low", "Low Temperature", attrgetter("templow"), "°C", SensorDeviceClass.TEMPERATURE),
+        _measurement("temphum_humidity_current", "Current Humidity", attrgetter("humiditycurrent"), "%", SensorDeviceClass.HUMIDITY),
+        _measurement("temphum_humidity_high", "High Humidity", attrgetter("humidityhigh"), "%", SensorDeviceClass.HUMIDITY),
+        _measurement("temphum_humidity_low", "Low Humidity", attrgetter("humiditylow"), "%", SensorDeviceClass.HUMIDITY),
+    ),
+    MODEL_FLOWMETER: (
+        _measurement("flow_current_used", "Flow Current Used", attrgetter("flowcurrentused"), "L"),
+        _measurement("flow_current_duration", "Flow Current Duration", attrgetter("flowcurrenduration"), "s"),
+        _measurement("flow_last_used", "Flow Last Used", attrgetter("flowlastused"), "L"),
+        _measurement("flow_last_used_duration", "Flow Last Used Duration", attrgetter("flowlastusedduration"), "s"),
+        _measurement("flow_total_today", "Flow Total Today", attrgetter("flowtotaltoday"), "L"),
+        # All-time cumulative total, like the rain total
+        _measurement(
+            "flow_total", "Flow Total", attrgetter("flowtotal"), "L",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+        _measurement("flow_battery", "Flow Battery", attrgetter("flowbatt"), "%", SensorDeviceClass.BATTERY),
+    ),
+    MODEL_CO2: (
+        _measurement("co2", "CO2", attrgetter("co2"), "ppm", SensorDeviceClass.CO2),
+        _measurement("co2_low", "CO2 Low", attrgetter("co2low"), "ppm", SensorDeviceClass.CO2),
+        _measurement("co2_high", "CO2 High", attrgetter("co2high"), "ppm", SensorDeviceClass.CO2),
+        _measurement("co2_temp", "CO2 Temperature", attrgetter("co2temp"), "°C", SensorDeviceClass.TEMPERATURE),
+        _measurement("co2_humidity", "CO2 Humidity", attrgetter("co2humidity"), "%", SensorDeviceClass.HUMIDITY),
+        _measurement("co2_battery", "CO2 Battery", attrgetter("co2batt"), "%", SensorDeviceClass.BATTERY),
+    ),
+    MODEL_POOL: (
+        _measurement("pool_current_temp", "Pool Current Temperature", attrgetter("tempcurrent"), "°C", SensorDeviceClass.TEMPERATURE),
+        _measurement("pool_high_temp", "Pool High Temperature", attrgetter("temphigh"), "°C", SensorDeviceClass.TEMPERATURE),
+        _measurement("pool_low_temp", "Pool Low Temperature", attrgetter("templow"), "°C", SensorDeviceClass.TEMPERATURE),
+        _measurement("pool_battery", "Pool Battery", attrgetter("tempbatt"), "%", SensorDeviceClass.BATTERY),
+    ),
+}
+
+
+def _latency(key: str, label: str) -> SensorEntityDescription:
+    return SensorEntityDescription(
+        key=key,
+        name=label,
+        native_unit_of_measurement="ms",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        suggested_display_precision=1,
+    )
+
+
+# Windows of the client's LatencyRecorder shown on the account device
+LATENCY_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
+    _latency(LATENCY_LOGIN, "Login Latency"),
+    _latency(LATENCY_TOKEN_REFRESH, "Token Refresh Latency"),
+    _latency(LATENCY_DEVICES, "getDeviceByHid Latency"),
+    _latency(LATENCY_STATUS, "getDeviceStatus Latency"),
+    _latency(LATENCY_DECODE, "Decode Time"),
+    _latency(LATENCY_DISPATCH, "Entity Dispatch Time"),
+    _latency(LATENCY_POLL, "Poll Time"),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     data = hass.data[DOMAIN][entry.entry_id]
-    coordinator: HomGarCoordinator = data["coordinator"]
+    coordinators: dict[int, HomGarCoordinator] = data["coordinators"]
+
+    entities: list[SensorEntity] = []
+
+    for coordinator in coordinators.values():
+        if coordinator.data:
+            _add_hub_entities(coordinator, entities)
+        else:
+            _add_hub_entities_later(entry, coordinator, async_add_entities)
+
+    client: HomGarClient = data["client"]
+    entities.extend(
+        HomGarLatencySensor(entry, description, client.latency.window(description.key))
+        for description in LATENCY_DESCRIPTIONS
+    )
+    for mid, coordinator in coordinators.items():
+        hub_name = data["account"].hubs.get(mid, {}).get("name", "Hub")
+        entities.append(
+            HomGarLatencySensor(
+                entry,
+                _latency(f"status_{mid}", f"{hub_name} ({mid}) Status Latency"),
+                coordinator.status_latency,
+            )
+        )
 
-    sensors_cfg = coordinator.data.get("sensors", {})
+    async_add_entities(entities)
 
-    entities: list[HomGarSensorBase] = []
 
-    for key, info in sensors_cfg.items():
-        model = info.get("model")
-        sub_name = info.get("sub_name") or f"addr_{info['addr']}"
-        home_name = info.get("home_name") or ""
+def _add_hub_entities(coordinator: HomGarCoordinator, entities: list[SensorEntity]) -> None:
+    """Create the entities for every sub-device of one hub coordinator."""
+    for key, info in coordinator.data.items():
+        descriptions = SENSOR_DESCRIPTIONS.get(info.model)
+        if not descriptions:
+            continue
+        sub_name = info.sub_name or f"addr_{info.addr}"
+        home_name = info.home_name or ""
         base_slug_parts = []
         if home_name:
             base_slug_parts.append(_slugify(home_name))
         base_slug_parts.append(_slugify(sub_name))
         base_slug = "_".join(base_slug_parts)
-        _LOGGER.debug("Creating sensor entity: key=%s, model=%s, sub_name=%s, home_name=%s, base_slug=%s, info=%s", key, model, sub_name, home_name, base_slug, info)
-
-        if model == MODEL_MOISTURE_SIMPLE:
-            # Moisture only
-            entities.append(
-                HomGarMoisturePercentSensor(
-                    coordinator, key, info, base_slug, simple=True
-                )
-            )
-        elif model == MODEL_MOISTURE_FULL:
-            # Moisture + temp + lux
-            entities.append(
-                HomGarMoisturePercentSensor(
-                    coordinator, key, info, base_slug, simple=False
-                )
-            )
-            entities.append(
-                HomGarTemperatureSensor(
-                    coordinator, key, info, base_slug
-                )
-            )
-            entities.append(
-                HomGarIlluminanceSensor(
-                    coordinator, key, info, base_slug
-                )
-            )
-        elif model == MODEL_RAIN:
-            entities.append(
-                HomGarRainSensor(
-                    coordinator,
-                    key,
-                    info,
-                    base_slug,
-                    "rain_last_hour_mm",
-                    "rain last hour",
-                )
-            )
-            entities.append(
-                HomGarRainSensor(
-                    coordinator,
-                    key,
-                    info,
-                    base_slug,
-                    "rain_last_24h_mm",
-                    "rain last 24h",
-                )
-            )
-            entities.append(
-                HomGarRainSensor(
-                    coordinator,
-                    key,
-                    info,
-                    base_slug,
-                    "rain_last_7d_mm",
-                    "rain last 7d",
-                )
-            )
-            entities.append(
-                HomGarRainTotalSensor(
-                    coordinator,
-                    key,
-                    info,
-                    base_slug,
-                    "rain_total_mm",
-                    "rain total",
-                )
-            )
-        elif model == MODEL_TEMPHUM:
-            entities.append(HomGarTempHumCurrentSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarTempHumHighSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarTempHumLowSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarTempHumHumidityCurrentSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarTempHumHumidityHighSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarTempHumHumidityLowSensor(coordinator, key, info, base_slug))
-        elif model == MODEL_FLOWMETER:
-            entities.append(HomGarFlowCurrentUsedSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarFlowCurrentDurationSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarFlowLastUsedSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarFlowLastUsedDurationSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarFlowTotalTodaySensor(coordinator, key, info, base_slug))
-            entities.append(HomGarFlowTotalSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarFlowBatterySensor(coordinator, key, info, base_slug))
-        elif model == MODEL_CO2:
-            entities.append(HomGarCO2Sensor(coordinator, key, info, base_slug))
-            entities.append(HomGarCO2LowSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarCO2HighSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarCO2TempSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarCO2HumiditySensor(coordinator, key, info, base_slug))
-            entities.append(HomGarCO2BatterySensor(coordinator, key, info, base_slug))
-        elif model == MODEL_POOL:
-            entities.append(HomGarPoolCurrentTempSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarPoolHighTempSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarPoolLowTempSensor(coordinator, key, info, base_slug))
-            entities.append(HomGarPoolBatterySensor(coordinator, key, info, base_slug))
-
-    if entities:
-        async_add_entities(entities)
-
-
-class HomGarSensorBase(CoordinatorEntity, SensorEntity):
-    """Base class for HomGar sensors."""
+        _LOGGER.debug("Creating sensor entities: key=%s, model=%s, sub_name=%s, home_name=%s, base_slug=%s", key, info.model, sub_name, home_name, base_slug)
+
+        entities.extend(
+            HomGarSensor(coordinator, key, info, base_slug, description)
+            for description in descriptions
+        )
+
+
+@callback
+def _add_hub_entities_later(
+    entry: ConfigEntry,
+    coordinator: HomGarCoordinator,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Create a hub's entities once it first delivers data.
+
+    For hubs that failed their first update or were missing from the
+    snapshot. The listener also keeps the hub polled until then.
+    """
+    added = False
+
+    @callback
+    def _async_first_data() -> None:
+        nonlocal added
+        if added or not coordinator.data:
+            return
+        added = True
+        hub_entities: list[SensorEntity] = []
+        _add_hub_entities(coordinator, hub_entities)
+        async_add_entities(hub_entities)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_first_data))
+
+
+class HomGarSensor(CoordinatorEntity, SensorEntity):
+    """A HomGar sub-device value, described by a HomGarSensorEntityDescription."""
+
+    entity_description: HomGarSensorEntityDescription
 
     _attr_should_poll = False
 
@@ -167,48 +292,68 @@ class HomGarSensorBase(CoordinatorEntity, SensorEntity):
         self,
         coordinator: HomGarCoordinator,
         sensor_key: str,
-        sensor_info: dict,
+        sensor_info: SensorEntry,
         base_slug: str,
+        description: HomGarSensorEntityDescription,
     ) -> None:
         super().__init__(coordinator)
+        self.entity_description = description
+        self._value_fn = description.value_fn
         self._sensor_key = sensor_key
         self._sensor_info = sensor_info
         self._base_slug = base_slug
-        _LOGGER.debug("Initialized HomGarSensorBase: sensor_key=%s, sensor_info=%s, base_slug=%s", sensor_key, sensor_info, base_slug)
+        self._last_update_success = coordinator.last_update_success
+        # Current entry and reading, re-bound only when the coordinator reports a change
+        self._sensor_entry: SensorEntry | None = None
+        self._reading: Reading | None = None
+        self._bind()
+
+        sub_name = sensor_info.sub_name
+        if description.fallback_sub_name is not None:
+            sub_name = sub_name or description.fallback_sub_name
+        self._attr_unique_id = f"homgar_{base_slug}_{description.key}"
+        self._attr_name = f"{sub_name} {description.label}"
+
+    def _bind(self) -> None:
+        """Look up this sensor's entry once, so properties are plain attribute reads."""
+        entry = self.coordinator.data.get(self._sensor_key) if self.coordinator.data else None
+        self._sensor_entry = entry
+        self._reading = entry.data if entry is not None else None
 
     @property
-    def _sensor_data(self) -> dict | None:
-        sensors = self.coordinator.data.get("sensors", {})
-        info = sensors.get(self._sensor_key)
-        if not info:
-            _LOGGER.debug("Sensor key %s not found in coordinator data", self._sensor_key)
-            return None
-        data = info.get("data")
-        _LOGGER.debug("Sensor key %s data: %s", self._sensor_key, data)
-        return data
+    def native_value(self) -> Any:
+        reading = self._reading
+        return self._value_fn(reading) if reading is not None else None
 
     @property
     def available(self) -> bool:
-        available = self._sensor_data is not None
-        _LOGGER.debug("Sensor %s available: %s", self._sensor_key, available)
-        return available
+        return self._last_update_success and self._reading is not None
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
+        # The coordinator may have refreshed between creation and being added
+        self._last_update_success = self.coordinator.last_update_success
+        self._bind()
         _LOGGER.debug("Sensor entity added to hass: %s", self._sensor_key)
 
     def _handle_coordinator_update(self) -> None:
-        _LOGGER.debug("Coordinator update for sensor: %s", self._sensor_key)
+        # Only rebind and write state when this sensor's reading or its hub's availability changed;
+        # an unchanged entry is the same object, so the existing binding stays valid
+        success = self.coordinator.last_update_success
+        if self._sensor_key not in self.coordinator.changed_keys and success == self._last_update_success:
+            return
+        self._last_update_success = success
+        self._bind()
         super()._handle_coordinator_update()
 
     @property
     def device_info(self) -> dict[str, Any]:
         """Represent each subDevice as its own HA device."""
-        hid = self._sensor_info["hid"]
-        mid = self._sensor_info["mid"]
-        addr = self._sensor_info["addr"]
-        sub_name = self._sensor_info.get("sub_name") or f"Sensor {addr}"
-        model = self._sensor_info.get("model") or "Unknown"
+        hid = self._sensor_info.hid
+        mid = self._sensor_info.mid
+        addr = self._sensor_info.addr
+        sub_name = self._sensor_info.sub_name or f"Sensor {addr}"
+        model = self._sensor_info.model or "Unknown"
 
         return {
             # Unique per subdevice
@@ -220,18 +365,17 @@ class HomGarSensorBase(CoordinatorEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        data = self._sensor_data or {}
+        data = self._reading
         attrs: dict[str, Any] = {}
-        if "rssi_dbm" in data:
-            attrs["rssi_dbm"] = data["rssi_dbm"]
-        if "battery_status_code" in data:
-            attrs["battery_status_code"] = data["battery_status_code"]
-
-        # Add last_updated from the latest raw_status time (ms since epoch)
-        sensors = self.coordinator.data.get("sensors", {})
-        info = sensors.get(self._sensor_key) or {}
-        raw_status = info.get("raw_status") or {}
-        ts = raw_status.get("time")
+        if data is not None:
+            if "rssi_dbm" in data:
+                attrs["rssi_dbm"] = data.rssi_dbm
+            if "battery_status_code" in data:
+                attrs["battery_status_code"] = data.battery_status_code
+
+        # Add last_updated from the latest report time (ms since epoch)
+        entry = self._sensor_entry
+        ts = entry.time if entry is not None else None
         if ts:
             try:
                 dt = datetime.fromtimestamp(ts / 1000, tz=timezone.utc)
@@ -243,499 +387,36 @@ class HomGarSensorBase(CoordinatorEntity, SensorEntity):
         return attrs
 
 
-class HomGarMoisturePercentSensor(HomGarSensorBase):
-    """Moisture % sensor."""
-
-    _attr_device_class = SensorDeviceClass.MOISTURE
-    _attr_native_unit_of_measurement = "%"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(
-        self,
-        coordinator: HomGarCoordinator,
-        sensor_key: str,
-        sensor_info: dict,
-        base_slug: str,
-        simple: bool,
-    ) -> None:
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._simple = simple
-        model = sensor_info.get("model", "")
-        sub_name = sensor_info.get("sub_name") or "Sensor"
-        self._attr_unique_id = f"homgar_{base_slug}_moisture_percent"
-        self._attr_name = f"{sub_name} Moisture Percent"
-
-    @property
-    def native_value(self) -> float | None:
-        data = self._sensor_data
-        value = data.get("moisture_percent") if data else None
-        _LOGGER.debug("native_value for %s (moisture_percent): %s", self._sensor_key, value)
-        return value
-
+class HomGarLatencySensor(SensorEntity):
+    """p95 of a latency window in ms, on a device standing for the account.
 
-class HomGarTemperatureSensor(HomGarSensorBase):
-    """Temperature sensor for HCS021FRF."""
+    Disabled by default. The state is refreshed by Home Assistant's entity
+    polling, which reads the window in memory and makes no request.
+    """
 
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = "°C"
-    _attr_state_class = SensorStateClass.MEASUREMENT
+    # Named after the device; the entry title holds the account email, kept out of entity ids
+    _attr_has_entity_name = True
 
-    def __init__(
-        self,
-        coordinator: HomGarCoordinator,
-        sensor_key: str,
-        sensor_info: dict,
-        base_slug: str,
-    ) -> None:
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        sub_name = sensor_info.get("sub_name") or "Sensor"
-        self._attr_unique_id = f"homgar_{base_slug}_temperature"
-        self._attr_name = f"{sub_name} Temperature"
+    def __init__(self, entry: ConfigEntry, description: SensorEntityDescription, window: LatencyWindow) -> None:
+        self.entity_description = description
+        self._entry = entry
+        self._window = window
+        self._attr_unique_id = f"homgar_{entry.entry_id}_latency_{description.key}"
 
     @property
     def native_value(self) -> float | None:
-        data = self._sensor_data
-        value = round(data.get("temperature_c"), 1) if data and data.get("temperature_c") is not None else None
-        _LOGGER.debug("native_value for %s (temperature_c): %s", self._sensor_key, value)
-        return value
-
-
-class HomGarIlluminanceSensor(HomGarSensorBase):
-    """Illuminance sensor for HCS021FRF."""
-
-    _attr_device_class = SensorDeviceClass.ILLUMINANCE
-    _attr_native_unit_of_measurement = "lx"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(
-        self,
-        coordinator: HomGarCoordinator,
-        sensor_key: str,
-        sensor_info: dict,
-        base_slug: str,
-    ) -> None:
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        sub_name = sensor_info.get("sub_name") or "Sensor"
-        self._attr_unique_id = f"homgar_{base_slug}_illuminance"
-        self._attr_name = f"{sub_name} Illuminance"
-
-    @property
-    def native_value(self) -> float | None:
-        data = self._sensor_data
-        value = data.get("illuminance_lux") if data else None
-        _LOGGER.debug("native_value for %s (illuminance_lux): %s", self._sensor_key, value)
-        return value
-
-
-class HomGarRainSensor(HomGarSensorBase):
-    """Rain sensor (various windows)."""
-
-    _attr_device_class = SensorDeviceClass.PRECIPITATION
-    _attr_native_unit_of_measurement = "mm"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(
-        self,
-        coordinator: HomGarCoordinator,
-        sensor_key: str,
-        sensor_info: dict,
-        base_slug: str,
-        data_key: str,
-        label: str,
-    ) -> None:
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._data_key = data_key
-        sub_name = sensor_info.get("sub_name") or "Rain Sensor"
-        slug_suffix = data_key
-        self._attr_unique_id = f"homgar_{base_slug}_{slug_suffix}"
-        # Format rain labels: convert to "Rain (Last X)" style
-        window = label.replace("rain", "").strip()
-        window_map = {
-            "last hour": "Last Hour",
-            "last 24h": "Last 24 Hours",
-            "last 7d": "Last 7 Days",
-            "total": "Total",
-        }
-        window_fmt = window_map.get(window, window.title())
-        self._attr_name = f"{sub_name} Rain ({window_fmt})"
-
-    @property
-    def native_value(self) -> float | None:
-        data = self._sensor_data
-        if not data:
-            return None
-        val = data.get(self._data_key)
-        if val is None:
-            return None
-        return round(val, 1)
-
-
-class HomGarRainTotalSensor(HomGarRainSensor):
-    """All-time cumulative rain total — TOTAL_INCREASING for proper HA statistics."""
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-
-# HCS014ARF (Temperature/Humidity)
-class HomGarTempHumCurrentSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = "°C"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_temphum_current"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Current Temperature"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("tempcurrent") if data else None
-
-
-class HomGarTempHumHighSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = "°C"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_temphum_high"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} High Temperature"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("temphigh") if data else None
-
-
-class HomGarTempHumLowSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = "°C"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_temphum_low"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Low Temperature"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("templow") if data else None
-
-
-class HomGarTempHumHumidityCurrentSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.HUMIDITY
-    _attr_native_unit_of_measurement = "%"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_temphum_humidity_current"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Current Humidity"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("humiditycurrent") if data else None
-
-
-class HomGarTempHumHumidityHighSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.HUMIDITY
-    _attr_native_unit_of_measurement = "%"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_temphum_humidity_high"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} High Humidity"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("humidityhigh") if data else None
-
-
-class HomGarTempHumHumidityLowSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.HUMIDITY
-    _attr_native_unit_of_measurement = "%"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_temphum_humidity_low"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Low Humidity"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("humiditylow") if data else None
-
-
-# HCS008FRF (Flowmeter)
-class HomGarFlowCurrentUsedSensor(HomGarSensorBase):
-    _attr_native_unit_of_measurement = "L"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_flow_current_used"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Flow Current Used"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("flowcurrentused") if data else None
-
-
-class HomGarFlowCurrentDurationSensor(HomGarSensorBase):
-    _attr_native_unit_of_measurement = "s"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_flow_current_duration"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Flow Current Duration"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("flowcurrenduration") if data else None
-
-
-class HomGarFlowLastUsedSensor(HomGarSensorBase):
-    _attr_native_unit_of_measurement = "L"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_flow_last_used"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Flow Last Used"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("flowlastused") if data else None
-
-
-class HomGarFlowLastUsedDurationSensor(HomGarSensorBase):
-    _attr_native_unit_of_measurement = "s"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_flow_last_used_duration"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Flow Last Used Duration"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("flowlastusedduration") if data else None
-
-
-class HomGarFlowTotalTodaySensor(HomGarSensorBase):
-    _attr_native_unit_of_measurement = "L"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_flow_total_today"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Flow Total Today"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("flowtotaltoday") if data else None
-
-
-class HomGarFlowTotalSensor(HomGarSensorBase):
-    _attr_native_unit_of_measurement = "L"
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_flow_total"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Flow Total"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("flowtotal") if data else None
-
-
-class HomGarFlowBatterySensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.BATTERY
-    _attr_native_unit_of_measurement = "%"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_flow_battery"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Flow Battery"
+        return self._window.percentile(95)
 
     @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("flowbatt") if data else None
-
-
-# HCS0530THO (CO2/Temp/Humidity)
-class HomGarCO2Sensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.CO2
-    _attr_native_unit_of_measurement = "ppm"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_co2"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} CO2"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("co2") if data else None
-
-
-class HomGarCO2LowSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.CO2
-    _attr_native_unit_of_measurement = "ppm"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_co2_low"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} CO2 Low"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("co2low") if data else None
-
-
-class HomGarCO2HighSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.CO2
-    _attr_native_unit_of_measurement = "ppm"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_co2_high"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} CO2 High"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("co2high") if data else None
-
-
-class HomGarCO2TempSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = "°C"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_co2_temp"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} CO2 Temperature"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("co2temp") if data else None
-
-
-class HomGarCO2HumiditySensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.HUMIDITY
-    _attr_native_unit_of_measurement = "%"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_co2_humidity"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} CO2 Humidity"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("co2humidity") if data else None
-
-
-class HomGarCO2BatterySensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.BATTERY
-    _attr_native_unit_of_measurement = "%"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_co2_battery"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} CO2 Battery"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("co2batt") if data else None
-
-
-# HCS0528ARF (Pool/Temperature)
-class HomGarPoolCurrentTempSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = "°C"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_pool_current_temp"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Pool Current Temperature"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("tempcurrent") if data else None
-
-
-class HomGarPoolHighTempSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = "°C"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_pool_high_temp"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Pool High Temperature"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("temphigh") if data else None
-
-
-class HomGarPoolLowTempSensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = "°C"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_pool_low_temp"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Pool Low Temperature"
-
-    @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("templow") if data else None
-
-
-class HomGarPoolBatterySensor(HomGarSensorBase):
-    _attr_device_class = SensorDeviceClass.BATTERY
-    _attr_native_unit_of_measurement = "%"
-    _attr_state_class = SensorStateClass.MEASUREMENT
-
-    def __init__(self, coordinator, sensor_key, sensor_info, base_slug):
-        super().__init__(coordinator, sensor_key, sensor_info, base_slug)
-        self._attr_unique_id = f"homgar_{base_slug}_pool_battery"
-        self._attr_name = f"{sensor_info.get('sub_name', 'Sensor')} Pool Battery"
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self._window.summary()
 
     @property
-    def native_value(self):
-        data = self._sensor_data
-        return data.get("tempbatt") if data else None
+    def device_info(self) -> dict[str, Any]:
+        return {
+            "identifiers": {(DOMAIN, f"account_{self._entry.entry_id}")},
+            "name": "HomGar cloud",
+            "manufacturer": "HomGar",
+            "model": "Cloud account",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
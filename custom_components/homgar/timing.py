@@ -0,0 +1,88 @@
+import math
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Iterator
+
+from .const import TIMING_WINDOW_SIZE
+
+# Windows of the client's LatencyRecorder: API requests, then poll phases summed over all hubs
+LATENCY_LOGIN = "login"
+LATENCY_TOKEN_REFRESH = "token_refresh"
+LATENCY_DEVICES = "getDeviceByHid"
+LATENCY_STATUS = "getDeviceStatus"
+LATENCY_DECODE = "decode"
+LATENCY_DISPATCH = "dispatch"
+LATENCY_POLL = "poll"
+
+
+class LatencyWindow:
+    """Durations of the last size samples of one operation, in milliseconds.
+
+    Samples live in a ring of C doubles, as every hub keeps a window.
+    """
+
+    __slots__ = ("samples", "size", "count")
+
+    def __init__(self, size: int = TIMING_WINDOW_SIZE) -> None:
+        self.samples = array("d")
+        self.size = size
+        self.count = 0  # samples ever added
+
+    def add(self, seconds: float) -> None:
+        if len(self.samples) < self.size:
+            self.samples.append(seconds * 1000)
+        else:
+            self.samples[self.count % self.size] = seconds * 1000
+        self.count += 1
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank percentile of the window, or None while it is empty."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+    def summary(self) -> dict[str, float | int | None]:
+        samples = self.samples
+        return {
+            "p50": _round(self.percentile(50)),
+            "p95": _round(self.percentile(95)),
+            "max": _round(max(samples)) if samples else None,
+            "last": _round(samples[(self.count - 1) % self.size]) if samples else None,
+            "samples": len(samples),
+            "count": self.count,
+        }
+
+
+def _round(ms: float | None) -> float | None:
+    return round(ms, 3) if ms is not None else None
+
+
+class LatencyRecorder:
+    """Sliding latency windows by name, created on first use."""
+
+    def __init__(self, size: int = TIMING_WINDOW_SIZE) -> None:
+        self.size = size
+        self.windows: dict[str, LatencyWindow] = {}
+
+    def window(self, name: str) -> LatencyWindow:
+        window = self.windows.get(name)
+        if window is None:
+            window = self.windows[name] = LatencyWindow(self.size)
+        return window
+
+    def add(self, name: str, seconds: float) -> None:
+        self.window(name).add(seconds)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Add the duration of the with block, also when it raised or timed out."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.window(name).add(time.perf_counter() - started)
+
+    def summary(self) -> dict[str, dict]:
+        return {name: window.summary() for name, window in self.windows.items()}
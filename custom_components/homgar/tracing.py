@@ -0,0 +1,77 @@
+import logging
+import random
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from .const import TRACE_BUFFER_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_filter(value: str | None, cast=str) -> frozenset:
+    """Turn a comma separated option string into a filter set ("" means no filter)."""
+    if not value:
+        return frozenset()
+    return frozenset(cast(part.strip()) for part in value.split(",") if part.strip())
+
+
+class PayloadTracer:
+    """Opt-in capture of API responses and sub-device payloads.
+
+    Off by default, and hot paths only check the enabled attribute. When on,
+    records matching the mid/addr/model filter are sampled into a bounded
+    ring buffer (downloadable with the config entry diagnostics) and logged
+    at debug level. A record only matches a filter it carries a value for,
+    so an addr filter captures sub-device readings but not whole hub responses.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        sample_rate: float = 1.0,
+        mids: Iterable[int] = (),
+        addrs: Iterable[int] = (),
+        models: Iterable[str] = (),
+        size: int = TRACE_BUFFER_SIZE,
+    ) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.mids = frozenset(mids)
+        self.addrs = frozenset(addrs)
+        self.models = frozenset(models)
+        self.buffer: deque[dict] = deque(maxlen=size)
+        self.dropped = 0  # matching records skipped by sampling
+
+    def wants(self, mid: int | None = None, addr: int | None = None, model: str | None = None) -> bool:
+        """Whether a record with these keys passes the filter and the sampling."""
+        if not self.enabled:
+            return False
+        if self.mids and mid not in self.mids:
+            return False
+        if self.addrs and addr not in self.addrs:
+            return False
+        if self.models and model not in self.models:
+            return False
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            self.dropped += 1
+            return False
+        return True
+
+    def record(self, kind: str, **fields: Any) -> None:
+        entry = {"at": datetime.now(timezone.utc).isoformat(), "kind": kind, **fields}
+        self.buffer.append(entry)
+        _LOGGER.debug("HomGar trace %s: %s", kind, entry)
+
+    def dump(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "filter": {
+                "mids": sorted(self.mids),
+                "addrs": sorted(self.addrs),
+                "models": sorted(self.models),
+            },
+            "dropped": self.dropped,
+            "records": list(self.buffer),
+        }